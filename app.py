@@ -41,7 +41,7 @@ st.markdown("""
 # Create radio buttons for model selection
 selected_model = st.radio(
     "Select an Options Pricing Model",
-    ["Black-Scholes Model", "Binomial Options Pricing Model", "Trinomial Options Pricing Model"]
+    ["Black-Scholes Model", "Binomial Options Pricing Model", "Trinomial Options Pricing Model", "Monte Carlo Simulation Model", "Portfolio Scenario Analysis"]
 )
 
 # Add a button to navigate to the selected model
@@ -51,4 +51,8 @@ if st.button("Show Model", use_container_width=True):
     elif selected_model == "Binomial Options Pricing Model":
         st.switch_page("pages/2_binomial-model.py")
     elif selected_model == "Trinomial Options Pricing Model":
-        st.switch_page("pages/3_trinomial-model.py")
\ No newline at end of file
+        st.switch_page("pages/3_trinomial-model.py")
+    elif selected_model == "Monte Carlo Simulation Model":
+        st.switch_page("pages/4_monte-carlo-model.py")
+    elif selected_model == "Portfolio Scenario Analysis":
+        st.switch_page("pages/5_scenario-analysis.py")
\ No newline at end of file
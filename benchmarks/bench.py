@@ -0,0 +1,257 @@
+"""Speed, memory and convergence benchmarks for the pricing engines.
+
+    python -m benchmarks.bench                      # print results
+    python -m benchmarks.bench --check              # compare against baseline.json, exit 1 on regression
+    python -m benchmarks.bench --update-baseline    # record the current results as the baseline
+    python -m benchmarks.bench --plot convergence.png
+
+Throughput is reported as contracts priced per second and memory as the
+tracemalloc peak of one call. Convergence is the maximum absolute error of the
+European lattice prices against Black-Scholes over a fixed set of contracts.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from pricing import (
+    adaptive_price,
+    binomial_greeks,
+    binomial_ladder,
+    binomial_model,
+    black_scholes,
+    black_scholes_greeks,
+    ensure_surface,
+    finite_difference_grid,
+    implied_volatility,
+    trinomial_greeks,
+    trinomial_ladder,
+    trinomial_model,
+)
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+CONVERGENCE_STEPS = (25, 50, 100, 200, 400, 800)
+
+
+def _contracts(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "S": rng.uniform(80, 120, size),
+        "K": rng.uniform(80, 120, size),
+        "T": rng.uniform(0.1, 2.0, size),
+        "r": rng.uniform(0.0, 0.06, size),
+        "sigma": rng.uniform(0.1, 0.5, size),
+        "option_type": rng.random(size) < 0.5,
+    }
+
+
+def _cases():
+    """(name, contracts per call, zero-argument callable) for every timed case."""
+    cases = []
+    for size in (1, 1_000, 1_000_000):
+        c = _contracts(size)
+        cases.append((f"black_scholes/batch={size}", size, lambda c=c: black_scholes(**c)))
+    c = _contracts(100_000)
+    cases.append(("black_scholes_greeks/batch=100000", 100_000, lambda c=c: black_scholes_greeks(**c)))
+    prices = black_scholes(**c)
+    cases.append((
+        "implied_volatility/batch=100000", 100_000,
+        lambda c=c, prices=prices: implied_volatility(prices, c["S"], c["K"], c["T"], c["r"], c["option_type"]),
+    ))
+
+    for name, engine in (("binomial_model", binomial_model), ("trinomial_model", trinomial_model)):
+        for N in (50, 200, 500):
+            for size in (1, 100):
+                c = _contracts(size)
+                cases.append((f"{name}/N={N}/batch={size}", size, lambda engine=engine, c=c, N=N: engine(N=N, **c)))
+        c = _contracts(100)
+        cases.append((
+            f"{name}/N=200/batch=100/american", 100,
+            lambda engine=engine, c=c: engine(N=200, exercise="american", **c),
+        ))
+        # Heatmap grids: a square S x sigma grid for one contract
+        for grid in (10, 50):
+            S_range = np.linspace(80, 120, grid)[:, None]
+            sigma_range = np.linspace(0.1, 0.5, grid)[None, :]
+            cases.append((
+                f"{name}/heatmap={grid}x{grid}/N=100", grid * grid,
+                lambda engine=engine, S=S_range, sigma=sigma_range: engine(S, 100.0, 1.0, 0.05, sigma, 100),
+            ))
+
+    # Target-error pricing (smoothed trees + Richardson) against the fixed N=500 cases above
+    for model in ("binomial", "trinomial"):
+        c = _contracts(100)
+        cases.append((
+            f"adaptive_price/{model}/tolerance=0.01/batch=100", 100,
+            lambda model=model, c=c: adaptive_price(model, tolerance=0.01, **c),
+        ))
+        cases.append((
+            f"adaptive_price/{model}/tolerance=0.01/batch=100/american", 100,
+            lambda model=model, c=c: adaptive_price(model, exercise="american", tolerance=0.01, **c),
+        ))
+
+    # Strike ladders: 101 strikes, calls and puts, on one shared tree
+    strikes = np.linspace(80, 120, 101)
+    for name, ladder in (("binomial_ladder", binomial_ladder), ("trinomial_ladder", trinomial_ladder)):
+        for exercise in ("european", "american"):
+            cases.append((
+                f"{name}/N=200/strikes=101/{exercise}", 2 * strikes.size,
+                lambda ladder=ladder, exercise=exercise: ladder(100.0, strikes, 1.0, 0.05, 0.2, 200, exercise=exercise),
+            ))
+
+    # Finite-difference heatmaps: one PDE solve per sigma column, whatever the S resolution
+    for rows in (10, 200):
+        S_range = np.linspace(80, 120, rows)
+        sigma_range = np.linspace(0.1, 0.5, 10)
+        cases.append((
+            f"finite_difference_grid/heatmap={rows}x10", rows * 10,
+            lambda S=S_range, sigma=sigma_range: finite_difference_grid(S, 100.0, 1.0, 0.05, sigma),
+        ))
+        cases.append((
+            f"finite_difference_grid/heatmap={rows}x10/american", rows * 10,
+            lambda S=S_range, sigma=sigma_range: finite_difference_grid(S, 100.0, 1.0, 0.05, sigma, "put", exercise="american"),
+        ))
+
+    # Interpolated lookups on a small precomputed binomial surface
+    surface = ensure_surface(Path(tempfile.gettempdir()) / "bench-binomial-50.surf", "binomial", 50,
+                             log_moneyness=(-0.5, 0.5, 41), total_vol=(0.05, 1.5, 30), rate_time=(0.0, 0.2, 5))
+    c = _contracts(100_000)
+    cases.append(("price_surface/batch=100000", 100_000, lambda c=c: surface.price(**c)))
+
+    for name, engine in (("binomial_greeks", binomial_greeks), ("trinomial_greeks", trinomial_greeks)):
+        c = _contracts(100)
+        cases.append((f"{name}/N=200/batch=100", 100, lambda engine=engine, c=c: engine(N=200, **c)))
+    return cases
+
+
+def _time(func, min_time=0.2, repeat=5):
+    """Best seconds per call over ``repeat`` rounds of at least ``min_time`` each."""
+    func()  # warm up
+    best = np.inf
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+
+def _peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_performance():
+    results = {}
+    for name, contracts, func in _cases():
+        seconds = _time(func)
+        results[name] = {"ops_per_sec": contracts / seconds, "peak_bytes": _peak_memory(func)}
+        print(f"{name:48s} {contracts / seconds:>14,.0f} contracts/s {results[name]['peak_bytes'] / 1e6:>10.2f} MB")
+    return results
+
+
+def run_convergence():
+    c = _contracts(200, seed=1)
+    reference = black_scholes(**c)
+    errors = {}
+    print(f"\n{'N':>6s} {'binomial max err':>18s} {'trinomial max err':>18s}")
+    for N in CONVERGENCE_STEPS:
+        errors[str(N)] = {
+            "binomial_model": float(np.abs(binomial_model(N=N, **c) - reference).max()),
+            "trinomial_model": float(np.abs(trinomial_model(N=N, **c) - reference).max()),
+        }
+        print(f"{N:>6d} {errors[str(N)]['binomial_model']:>18.6f} {errors[str(N)]['trinomial_model']:>18.6f}")
+    return errors
+
+
+def check(results, baseline, speed_tolerance, memory_tolerance, accuracy_tolerance):
+    """List of human-readable regressions of ``results`` against ``baseline``."""
+    failures = []
+    for name, base in baseline["performance"].items():
+        current = results["performance"].get(name)
+        if current is None:
+            failures.append(f"{name}: missing from this run")
+            continue
+        if current["ops_per_sec"] < base["ops_per_sec"] * (1 - speed_tolerance):
+            failures.append(
+                f"{name}: {current['ops_per_sec']:,.0f} contracts/s is more than {speed_tolerance:.0%} "
+                f"below the baseline {base['ops_per_sec']:,.0f}"
+            )
+        if current["peak_bytes"] > base["peak_bytes"] * (1 + memory_tolerance):
+            failures.append(
+                f"{name}: peak memory {current['peak_bytes']:,} B is more than {memory_tolerance:.0%} "
+                f"above the baseline {base['peak_bytes']:,} B"
+            )
+    for N, base_errors in baseline["convergence"].items():
+        for model, base_error in base_errors.items():
+            error = results["convergence"].get(N, {}).get(model)
+            if error is None or error > base_error * (1 + accuracy_tolerance) + 1e-12:
+                failures.append(f"{model} N={N}: max error {error} exceeds the baseline {base_error:.3g}")
+    return failures
+
+
+def plot_convergence(errors, path):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    steps = [int(N) for N in errors]
+    fig, ax = plt.subplots(figsize=(8, 5))
+    for model in ("binomial_model", "trinomial_model"):
+        ax.loglog(steps, [errors[str(N)][model] for N in steps], marker="o", label=model)
+    ax.set_xlabel("Steps (N)")
+    ax.set_ylabel("Max abs error vs Black-Scholes")
+    ax.set_title("Lattice convergence")
+    ax.legend()
+    fig.savefig(path, bbox_inches="tight")
+    plt.close(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pricing engines.")
+    parser.add_argument("--check", action="store_true", help="fail if results regress against the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results to the baseline file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--speed-tolerance", type=float, default=0.3, help="allowed fractional slowdown")
+    parser.add_argument("--memory-tolerance", type=float, default=0.2, help="allowed fractional memory growth")
+    parser.add_argument("--accuracy-tolerance", type=float, default=0.01, help="allowed fractional error growth")
+    parser.add_argument("--plot", type=Path, help="save a convergence plot to this path")
+    args = parser.parse_args(argv)
+
+    results = {"performance": run_performance(), "convergence": run_convergence()}
+    if args.plot:
+        plot_convergence(results["convergence"], args.plot)
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+    if args.check:
+        baseline = json.loads(args.baseline.read_text())
+        failures = check(results, baseline, args.speed_tolerance, args.memory_tolerance, args.accuracy_tolerance)
+        if failures:
+            print("\nREGRESSIONS AGAINST BASELINE:", file=sys.stderr)
+            for failure in failures:
+                print(f"  FAIL {failure}", file=sys.stderr)
+            return 1
+        print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
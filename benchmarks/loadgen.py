@@ -0,0 +1,117 @@
+"""Load generator for pricing_service.py.
+
+    python pricing_service.py &
+    python -m benchmarks.loadgen --concurrency 64 --duration 10 --model binomial --steps 200
+
+Opens ``--concurrency`` keep-alive connections, each sending single-contract
+requests back to back, drawn from a pool of ``--distinct`` random contracts (a
+small pool exercises the cache, a large one the engines). Prints client-side
+throughput, latency percentiles and status counts, then the server's /metrics.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+
+async def _request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+def _contracts(args):
+    rng = np.random.default_rng(args.seed)
+    contracts = []
+    for _ in range(args.distinct):
+        contract = {
+            "model": args.model,
+            "S": round(float(rng.uniform(80, 120)), 2),
+            "K": float(rng.choice(np.arange(80, 125, 5))),
+            "T": round(float(rng.uniform(0.1, 2.0)), 2),
+            "r": 0.05,
+            "sigma": round(float(rng.uniform(0.1, 0.5)), 3),
+            "option_type": "call" if rng.random() < 0.5 else "put",
+        }
+        if args.model != "black-scholes":
+            contract.update(N=args.steps, exercise=args.exercise)
+        contracts.append(contract)
+    return contracts
+
+
+async def _client(args, contracts, deadline, latencies, statuses, rng):
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        while time.perf_counter() < deadline:
+            contract = contracts[rng.integers(len(contracts))]
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, "POST", f"/{args.endpoint}", contract)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+
+async def run(args):
+    contracts = _contracts(args)
+    latencies = []
+    statuses = Counter()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(
+        _client(args, contracts, deadline, latencies, statuses, np.random.default_rng(args.seed + 1 + n))
+        for n in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1e3
+    print(f"{len(latencies):,} requests in {elapsed:.1f} s ({len(latencies) / elapsed:,.0f} req/s) "
+          f"over {args.concurrency} connections")
+    print(f"client latency p50 {np.percentile(latencies_ms, 50):.2f} ms, "
+          f"p99 {np.percentile(latencies_ms, 99):.2f} ms, max {latencies_ms.max():.2f} ms")
+    print("status codes:", dict(sorted(statuses.items())))
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, metrics = await _request(reader, writer, "GET", "/metrics")
+    writer.close()
+    print("server metrics:", json.dumps(metrics, indent=2))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--endpoint", choices=("price", "greeks"), default="price")
+    parser.add_argument("--model", choices=("black-scholes", "binomial", "trinomial"), default="black-scholes")
+    parser.add_argument("--steps", type=int, default=100, help="lattice steps N (binomial/trinomial)")
+    parser.add_argument("--exercise", choices=("european", "american"), default="european")
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--distinct", type=int, default=100_000, help="size of the random contract pool")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run(parse_args()))
+    except ConnectionRefusedError:
+        sys.exit("could not connect to the pricing service; start it with `python pricing_service.py`")
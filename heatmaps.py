@@ -0,0 +1,103 @@
+"""Cached heatmap rendering for the Streamlit pages.
+
+Small grids are drawn as annotated seaborn figures and saved to PNG once.
+The figures are created without pyplot, so they are never registered globally
+(nothing to close or leak) and sessions can render concurrently. Large grids
+skip matplotlib figures altogether: the values are mapped through the colormap
+straight into an RGBA array (a few milliseconds even for 200x200) and described
+by a caption instead of tick labels. Either way the result is cached on a
+digest of the values, labels and styling, so reruns with an unchanged grid do
+no rendering at all.
+"""
+
+import hashlib
+import io
+
+import matplotlib
+import numpy as np
+import seaborn as sns
+from matplotlib.figure import Figure
+
+from pricing.cache import PriceCache
+
+# Grids with at most this many cells are drawn as annotated figures; larger ones as plain images
+ANNOTATE_CELLS = 225
+# Approximate pixel size of the image for large grids (each cell is an integer block of pixels)
+IMAGE_SIZE = (480, 800)
+
+_images = PriceCache(maxsize=256)
+
+
+def _digest(values, *labels):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((values.shape, labels)).encode())
+    h.update(values.tobytes())
+    return h.hexdigest()
+
+
+def _thin(labels, size):
+    # Keep about ten tick labels per axis
+    step = max(size // 10, 1)
+    return [label if i % step == 0 else "" for i, label in enumerate(labels)]
+
+
+def _figure(values, row_labels, col_labels, title, xlabel, ylabel, fmt, cmap, center):
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    sns.heatmap(
+        values,
+        yticklabels=_thin(row_labels, values.shape[0]),
+        xticklabels=_thin(col_labels, values.shape[1]),
+        annot=True,
+        fmt=fmt,
+        cmap=cmap,
+        center=center,
+        ax=ax
+    )
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=150, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def _array_image(values, cmap, center):
+    finite = values[np.isfinite(values)]
+    low, high = (finite.min(), finite.max()) if finite.size else (0.0, 1.0)
+    if center is not None:
+        # Symmetric around the center, like seaborn's diverging maps
+        spread = max(abs(low - center), abs(high - center))
+        low, high = center - spread, center + spread
+    scaled = (values - low) / (high - low) if high > low else np.full(values.shape, 0.5)
+    # Unpriced (NaN) cells stay transparent
+    rgba = matplotlib.colormaps[cmap or "rocket"](np.ma.masked_invalid(scaled), bytes=True)
+    rows, cols = values.shape
+    return np.repeat(np.repeat(rgba, max(IMAGE_SIZE[0] // rows, 1), axis=0), max(IMAGE_SIZE[1] // cols, 1), axis=1), low, high
+
+
+def render_heatmap(values, row_labels, col_labels, title="", xlabel="", ylabel="", fmt=".2f", cmap=None, center=None):
+    """Heatmap of ``values`` as an image for ``st.image``, with a caption (None for annotated figures).
+
+    ``row_labels`` and ``col_labels`` are the full lists of tick labels; they are
+    thinned for display. Unpriced cells (NaN) are left blank.
+    """
+    values = np.ascontiguousarray(values, dtype=float)
+    row_labels, col_labels = [str(label) for label in row_labels], [str(label) for label in col_labels]
+    key = _digest(values, row_labels, col_labels, title, xlabel, ylabel, fmt, cmap, center)
+    cached = _images.get(key)
+    if cached is not None:
+        return cached
+
+    if values.size <= ANNOTATE_CELLS:
+        result = _figure(values, row_labels, col_labels, title, xlabel, ylabel, fmt, cmap, center), None
+    else:
+        image, low, high = _array_image(values, cmap, center)
+        caption = (
+            f"{title}: rows are {ylabel} from {row_labels[0]} (top) to {row_labels[-1]} (bottom), "
+            f"columns are {xlabel} from {col_labels[0]} (left) to {col_labels[-1]} (right); "
+            f"the colour scale spans {low:{fmt}} to {high:{fmt}}"
+        )
+        result = image, caption
+    _images.set(key, result)
+    return result
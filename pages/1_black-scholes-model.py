@@ -1,9 +1,11 @@
-import math
-from scipy.stats import norm
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from heatmaps import render_heatmap
+from performance_panel import show_performance_panel
+from pricing import black_scholes, black_scholes_greeks, cached_call, cached_grid, default_cache, finite_difference_grid, implied_volatility
+from pricing.instrument import stage, start_recording
+from pricing.implied_vol import IV_ABOVE_MAXIMUM, IV_BELOW_INTRINSIC, IV_INVALID_INPUT, IV_NO_TIME_VALUE
 
 # Page configuration
 st.set_page_config(
@@ -15,45 +17,33 @@ st.set_page_config(
 if st.sidebar.button("🏠 Home", use_container_width=True):
     st.switch_page("app.py")
 
-def black_scholes(S, K, T, r, sigma, option_type="call"):
-    d1 = (math.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
-    
-    if option_type == "call":
-        price = S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
-    else:
-        price = K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-    
-    return price
-
-def generate_heatmap(S_min, S_max, sigma_min, sigma_max,S,K,T,r,sigma,option_type):
-    S_range = np.linspace(S_min, S_max, 10)
+def generate_heatmap(S_min, S_max, sigma_min, sigma_max,S,K,T,r,sigma,option_type, greek="price", rows=10, engine=None):
+    S_range = np.linspace(S_min, S_max, rows)
     sigma_range = np.linspace(sigma_min, sigma_max, 10)
-    prices = np.zeros((len(S_range), len(sigma_range)))
-    
-    for i, S in enumerate(S_range):
-        for j, sigma in enumerate(sigma_range):
-            prices[i, j] = black_scholes(S, K, T, r, sigma, option_type)
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(prices,
-        yticklabels=np.round(S_range, 2),
-        xticklabels=np.round(sigma_range, 2),
-        annot=True,
-        fmt=".2f",
-        #cmap="RdYlGn",
-        ax=ax
-    )
-    ax.set_xlabel("Volatility (σ)")
-    ax.set_ylabel("Stock Price (S)")
-    ax.set_title("Pricing of the option according to BSM")
-    return fig
+    with stage("heatmap/compute"):
+        if engine == "Finite difference (Crank-Nicolson)":
+            # One PDE solve per sigma column gives every S row at once
+            prices = cached_call(finite_difference_grid, S_range=tuple(S_range), sigma_range=tuple(sigma_range), K=K, T=T, r=r, option_type=option_type, field=greek)
+        elif greek == "price":
+            prices = cached_grid(black_scholes, S_range, sigma_range, K=K, T=T, r=r, option_type=option_type)
+        else:
+            prices = cached_grid(black_scholes_greeks, S_range, sigma_range, field=greek, K=K, T=T, r=r, option_type=option_type)
+
+    with stage("heatmap/render"):
+        return render_heatmap(
+            prices,
+            [f"{v:.2f}" for v in S_range],
+            [f"{v:.2f}" for v in sigma_range],
+            title="Pricing of the option according to BSM" if greek == "price" else f"Pricing of the option according to BSM ({greek.capitalize()})",
+            xlabel="Volatility (σ)",
+            ylabel="Stock Price (S)"
+        )
 
 def create_sidebar():
     # Navigation
     selected_model = st.sidebar.selectbox(
         "Navigate to",
-        ["Black Scholes Option Pricing Model", "Binomial Options Pricing Model", "Trinomial Options Pricing Model"],
+        ["Black Scholes Option Pricing Model", "Binomial Options Pricing Model", "Trinomial Options Pricing Model", "Monte Carlo Simulation Model", "Portfolio Scenario Analysis"],
         index=0
     )
 
@@ -61,6 +51,10 @@ def create_sidebar():
         st.switch_page("pages/2_binomial-model.py")
     elif selected_model == "Trinomial Options Pricing Model":
         st.switch_page("pages/3_trinomial-model.py")
+    elif selected_model == "Monte Carlo Simulation Model":
+        st.switch_page("pages/4_monte-carlo-model.py")
+    elif selected_model == "Portfolio Scenario Analysis":
+        st.switch_page("pages/5_scenario-analysis.py")
 
     # Initialize parameters dictionary
     params = {}
@@ -80,6 +74,16 @@ def create_sidebar():
     params["S_max"] = st.sidebar.number_input("Max Stock Price (S_max)", min_value=0.01, value=params["S"] * 1.2, step = 0.01)
     params["sigma_min"] = st.sidebar.number_input("Min Volatility (σ_min)", min_value=0.01, max_value=1.0, value = params["sigma"] *0.5, step = 0.01)
     params["sigma_max"] = st.sidebar.number_input("Max Volatility (σ_max)",  min_value=0.01, max_value=1.0, value = params["sigma"] *1.5, step = 0.01)
+    params["heatmap_value"] = st.sidebar.selectbox("Heatmap Value", ("price", "delta", "gamma", "vega", "theta", "rho"))
+    # The PDE engine only yields price, delta and gamma along the S axis
+    engines = ("Black-Scholes (closed form)", "Finite difference (Crank-Nicolson)") if params["heatmap_value"] in ("price", "delta", "gamma") else ("Black-Scholes (closed form)",)
+    params["heatmap_engine"] = st.sidebar.selectbox("Heatmap Engine", engines)
+    params["heatmap_rows"] = int(st.sidebar.slider("Stock Price Rows", min_value=10, max_value=200, value=10))
+
+    # Performance Instrumentation
+    st.sidebar.header("Performance")
+    params["show_performance"] = st.sidebar.checkbox("Show Performance Panel", value=False)
+    params["track_allocations"] = st.sidebar.checkbox("Track Allocations (slower)", value=False, disabled=not params["show_performance"])
 
     return params
 
@@ -91,20 +95,59 @@ st.markdown("""***The Black-Scholes option pricing model is a mathematical model
 
 # Get parameters from sidebar
 params = create_sidebar()
+recorder = start_recording(params["show_performance"], params["track_allocations"])
 
 # Calculate and display option price
-price = black_scholes(
-    params["S"],
-    params["K"],
-    params["T"],
-    params["r"],
-    params["sigma"],
-    params["option_type"]
-)
+with stage("price"):
+    price = cached_call(
+        black_scholes,
+        S=params["S"],
+        K=params["K"],
+        T=params["T"],
+        r=params["r"],
+        sigma=params["sigma"],
+        option_type=params["option_type"]
+    )
 st.success(f"The {params['option_type']} option price is (according to the input values): ${price:.2f}")
 
+# Display Greeks
+with stage("greeks"):
+    greeks = cached_call(
+        black_scholes_greeks,
+        S=params["S"],
+        K=params["K"],
+        T=params["T"],
+        r=params["r"],
+        sigma=params["sigma"],
+        option_type=params["option_type"]
+    )
+for column, name in zip(st.columns(5), ("delta", "gamma", "vega", "theta", "rho")):
+    column.metric(name.capitalize(), f"{greeks[name]:.4f}")
+
+with st.expander("Implied Volatility"):
+    market_price = st.number_input("Market Option Price", min_value=0.0, value=round(price, 2), step=0.01)
+    implied_vol, status = implied_volatility(
+        market_price,
+        params["S"],
+        params["K"],
+        params["T"],
+        params["r"],
+        params["option_type"],
+        return_status=True
+    )
+    if status == IV_BELOW_INTRINSIC:
+        st.warning("The market price is below the option's intrinsic value (arbitrage); no implied volatility exists.")
+    elif status == IV_ABOVE_MAXIMUM:
+        st.warning("The market price is above the no-arbitrage upper bound; no implied volatility exists.")
+    elif status == IV_NO_TIME_VALUE:
+        st.warning("The market price has no time value, so the implied volatility cannot be resolved.")
+    elif status == IV_INVALID_INPUT:
+        st.warning("The stock price and strike must be positive to solve for the implied volatility.")
+    else:
+        st.info(f"The implied volatility for a market price of ${market_price:.2f} is: {implied_vol:.2%}")
+
 # Generate and display heatmap
-fig = generate_heatmap(
+image, caption = generate_heatmap(
     params["S_min"],
     params["S_max"],
     params["sigma_min"],
@@ -114,9 +157,23 @@ fig = generate_heatmap(
     params["T"],
     params["r"],
     params["sigma"],
-    params["option_type"]
+    params["option_type"],
+    greek=params["heatmap_value"],
+    rows=params["heatmap_rows"],
+    engine=params["heatmap_engine"]
 )
-st.pyplot(fig)
+with stage("heatmap/display"):
+    st.image(image, caption=caption, width="stretch", output_format="PNG")
+
+cache_stats = default_cache.stats()
+st.caption(
+    f"Price cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+    f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['size']}/{cache_stats['maxsize']} entries, "
+    f"{cache_stats['evictions']} evictions"
+)
+
+if recorder:
+    show_performance_panel(recorder.stop(), "black-scholes")
 
 # Additional information
 st.markdown("""---""")
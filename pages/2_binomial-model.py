@@ -1,7 +1,14 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from heatmaps import render_heatmap
+from performance_panel import show_performance_panel
+from pricing import adaptive_price, binomial_model, binomial_greeks, binomial_ladder, cached_call, cached_grid, default_cache, finite_difference_grid
+from pricing.instrument import stage, start_recording
+from pricing.progressive import ProgressiveGrid
+
+# Most lattice steps for the slider, and for the ladder, Greeks and heatmap in target-error mode
+MAX_STEPS = 500
 
 # Page configuration
 st.set_page_config(
@@ -13,51 +20,67 @@ st.set_page_config(
 if st.sidebar.button("🏠 Home", use_container_width=True):
     st.switch_page("app.py")
 
-def binomial_model(S, K, T, r, sigma, N, option_type="call"):
-    dt = T / N  # Time step
-    u = np.exp(sigma * np.sqrt(dt))  # Up factor
-    d = 1 / u  # Down factor
-    p = (np.exp(r * dt) - d) / (u - d)  # Risk-neutral probability
-    
-    stock_prices = np.zeros((N + 1, N + 1))
-    option_values = np.zeros((N + 1, N + 1))
-    
-    for i in range(N + 1):
-        for j in range(i + 1):
-            stock_prices[j, i] = S * (u ** (i - j)) * (d ** j)
-    
-    if option_type == "call":
-        option_values[:, N] = np.maximum(stock_prices[:, N] - K, 0)
+def start_heatmap(S_min, S_max, sigma_min, sigma_max, S, K, T, r, N, option_type, q=0.0, exercise="european", greek="price", rows=10, cols=10, engine=None, K_range=None):
+    # Reuse this session's heatmap job while the inputs are unchanged; otherwise cancel it and start afresh
+    key = (S_min, S_max, sigma_min, sigma_max, S, K, T, r, N, option_type, q, exercise, greek, rows, cols, engine, K_range)
+    current = st.session_state.get("heatmap_job")
+    if current is not None and current[0] == key:
+        return current[1:]
+    if current is not None:
+        current[1].cancel()
+
+    S_range = np.linspace(S_min, S_max, rows) if K_range is None else np.linspace(*K_range, rows)
+    sigma_range = np.linspace(sigma_min, sigma_max, cols)
+    if K_range is not None:
+        # Strike rows: one tree per sigma column prices the whole strike ladder
+        compute = lambda i, j: cached_call(binomial_ladder, S=S, K=tuple(S_range), T=T, r=r, sigma=tuple(sigma_range[j]), N=N, q=q, exercise=exercise)[option_type]
+    elif engine == "Finite difference (Crank-Nicolson)":
+        # One PDE solve per sigma column gives every S row at once
+        compute = lambda i, j: cached_call(finite_difference_grid, S_range=tuple(S_range), sigma_range=tuple(sigma_range[j]), K=K, T=T, r=r, option_type=option_type, q=q, exercise=exercise, field=greek)
+    elif greek == "price":
+        compute = lambda i, j: cached_grid(binomial_model, S_range[i], sigma_range[j], K=K, T=T, r=r, N=N, option_type=option_type, q=q, exercise=exercise)
+    else:
+        compute = lambda i, j: cached_grid(binomial_greeks, S_range[i], sigma_range[j], field=greek, K=K, T=T, r=r, N=N, option_type=option_type, q=q, exercise=exercise)
+    by_column = K_range is not None or engine == "Finite difference (Crank-Nicolson)"
+    job = ProgressiveGrid(compute, (rows, cols), by_column=by_column).start()
+    st.session_state["heatmap_job"] = (key, job, S_range, sigma_range)
+    return job, S_range, sigma_range
+
+def generate_heatmap(prices, row_values, sigma_range, greek="price", strike_rows=False):
+    return render_heatmap(
+        prices,
+        [f"{v:.2f}" for v in row_values],
+        [f"{v:.2f}" for v in sigma_range],
+        title="Binomial Option Pricing Model" if greek == "price" else f"Binomial Option Pricing Model ({greek.capitalize()})",
+        xlabel="Volatility (σ)",
+        ylabel="Strike Price (K)" if strike_rows else "Stock Price (S)"
+    )
+
+def show_heatmap(job, row_values, sigma_range, greek="price", strike_rows=False, polling=False):
+    # Draws whatever part of the grid is priced so far; while polling, reruns every half second
+    prices, done = job.snapshot()
+    if job.error is not None:
+        st.error(f"Could not compute the heatmap: {job.error}")
+    elif np.isnan(prices).all():
+        st.info("Pricing the heatmap...")
     else:
-        option_values[:, N] = np.maximum(K - stock_prices[:, N], 0)
-    
-    for i in range(N - 1, -1, -1):
-        for j in range(i + 1):
-            option_values[j, i] = np.exp(-r * dt) * (p * option_values[j, i + 1] + (1 - p) * option_values[j + 1, i + 1])
-    
-    return option_values[0, 0]
-
-def generate_heatmap(S_min, S_max, sigma_min, sigma_max, K, T, r,sigma, N, option_type):
-    S_range = np.linspace(S_min, S_max, 10)
-    sigma_range = np.linspace(sigma_min, sigma_max, 10)
-    prices = np.zeros((len(S_range), len(sigma_range)))
-    
-    for i, S_val in enumerate(S_range):
-        for j, sigma_val in enumerate(sigma_range):
-            prices[i, j] = binomial_model(S_val, K, T, r, sigma_val,N, option_type)
-
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(prices, yticklabels=np.round(S_range, 2), xticklabels=np.round(sigma_range, 2), annot=True, fmt=".2f", ax=ax)
-    ax.set_xlabel("Volatility (σ)")
-    ax.set_ylabel("Stock Price (S)")
-    ax.set_title("Binomial Option Pricing Model")
-    return fig
+        with stage("heatmap/render"):
+            image, caption = generate_heatmap(prices, row_values, sigma_range, greek, strike_rows)
+        with stage("heatmap/display"):
+            st.image(image, caption=caption, width="stretch", output_format="PNG")
+        if done:
+            st.caption(f"Heatmap: {prices.size:,} cells in {job.elapsed:.2f} s")
+        else:
+            st.caption(f"Refining heatmap: {job.progress:.0%} of {prices.size:,} cells priced")
+    # Once the job finishes, rerun the page so the fragment stops polling
+    if polling and done:
+        st.rerun()
 
 def create_sidebar():
     # Navigation
     selected_model = st.sidebar.selectbox(
         "Navigate to",
-        ["Black Scholes Option Pricing Model", "Binomial Options Pricing Model", "Trinomial Options Pricing Model"],
+        ["Black Scholes Option Pricing Model", "Binomial Options Pricing Model", "Trinomial Options Pricing Model", "Monte Carlo Simulation Model", "Portfolio Scenario Analysis"],
         index=1
     )
 
@@ -65,6 +88,10 @@ def create_sidebar():
         st.switch_page("pages/1_black-scholes-model.py")
     elif selected_model == "Trinomial Options Pricing Model":
         st.switch_page("pages/3_trinomial-model.py")
+    elif selected_model == "Monte Carlo Simulation Model":
+        st.switch_page("pages/4_monte-carlo-model.py")
+    elif selected_model == "Portfolio Scenario Analysis":
+        st.switch_page("pages/5_scenario-analysis.py")
 
     # Initialize parameters dictionary
     params = {}
@@ -76,8 +103,19 @@ def create_sidebar():
     params["T"] = st.sidebar.number_input("Time to Maturity (T in years)", min_value=0.01, value=1.0)
     params["r"] = st.sidebar.number_input("Risk-Free Interest Rate (r as decimal)", min_value=0.0, value=0.05)
     params["sigma"] = st.sidebar.number_input("Volatility (σ as decimal)", min_value=0.01, value=0.2)
-    params["N"] = int(st.sidebar.slider("Number of N in Tree", min_value=10, max_value=500, value=50))
+    params["q"] = st.sidebar.number_input("Dividend Yield (q as decimal)", min_value=0.0, value=0.0)
+    params["accuracy_mode"] = st.sidebar.radio("Accuracy Mode", ("Fixed steps", "Target error"))
+    params["tolerance"] = None
+    if params["accuracy_mode"] == "Target error":
+        # N is chosen by the accuracy mode to meet the target
+        params["tolerance"] = float(st.sidebar.number_input("Target Error ($)", min_value=0.0001, max_value=1.0, value=0.01, step=0.001, format="%.4f"))
+        params["N"] = None
+    else:
+        params["N"] = int(st.sidebar.slider("Number of N in Tree", min_value=10, max_value=MAX_STEPS, value=50))
     params["option_type"] = st.sidebar.radio("Option Type", ("call", "put"))
+    params["exercise"] = st.sidebar.radio("Exercise Style", ("european", "american"))
+    params["ladder_strikes"] = int(st.sidebar.slider("Strike Ladder Strikes", min_value=3, max_value=101, value=11, step=2))
+    params["ladder_width"] = st.sidebar.slider("Strike Ladder Width (% of K)", min_value=5, max_value=50, value=20)
 
     # Heatmap Configuration
     st.sidebar.header("Heatmap Configuration")
@@ -85,6 +123,26 @@ def create_sidebar():
     params["S_max"] = st.sidebar.number_input("Max Stock Price (S_max)", min_value=0.01, value=params["S"] * 1.2, step = 0.01)
     params["sigma_min"] = st.sidebar.number_input("Min Volatility (σ_min)", min_value=0.01, max_value=1.0, value = params["sigma"] *0.5, step = 0.01)
     params["sigma_max"] = st.sidebar.number_input("Max Volatility (σ_max)",  min_value=0.01, max_value=1.0, value = params["sigma"] *1.5, step = 0.01)
+    params["heatmap_value"] = st.sidebar.selectbox("Heatmap Value", ("price", "delta", "gamma", "vega", "theta", "rho"))
+    # Strike rows come from the strike ladder, which only yields prices
+    axes = ("Stock Price", "Strike Price") if params["heatmap_value"] == "price" else ("Stock Price",)
+    params["heatmap_axis"] = st.sidebar.selectbox("Heatmap Rows", axes)
+    # The PDE engine only yields price, delta and gamma along the S axis
+    engines = ("Binomial tree", "Finite difference (Crank-Nicolson)") if params["heatmap_value"] in ("price", "delta", "gamma") and params["heatmap_axis"] == "Stock Price" else ("Binomial tree",)
+    params["heatmap_engine"] = st.sidebar.selectbox("Heatmap Engine", engines)
+    params["K_range"] = None
+    if params["heatmap_axis"] == "Strike Price":
+        params["K_range"] = (
+            float(st.sidebar.number_input("Min Strike Price (K_min)", min_value=0.01, value=params["K"] * 0.8, step = 0.01)),
+            float(st.sidebar.number_input("Max Strike Price (K_max)", min_value=0.01, value=params["K"] * 1.2, step = 0.01)),
+        )
+    params["heatmap_rows"] = int(st.sidebar.slider(f"{params['heatmap_axis']} Rows", min_value=10, max_value=200, value=10))
+    params["heatmap_cols"] = int(st.sidebar.slider("Volatility Columns", min_value=10, max_value=100, value=10))
+
+    # Performance Instrumentation
+    st.sidebar.header("Performance")
+    params["show_performance"] = st.sidebar.checkbox("Show Performance Panel", value=False)
+    params["track_allocations"] = st.sidebar.checkbox("Track Allocations (slower)", value=False, disabled=not params["show_performance"])
 
     return params
 
@@ -95,33 +153,144 @@ st.markdown("""***The Binomial Options Pricing Model is a numerical method for v
 
 # Get parameters from sidebar
 params = create_sidebar()
+recorder = start_recording(params["show_performance"], params["track_allocations"])
 
 # Calculate and display option price
-price = binomial_model(
-    float(params["S"]),
-    float(params["K"]),
-    float(params["T"]),
-    float(params["r"]),
-    float(params["sigma"]),
-    int(params["N"]),  # Ensure N is an integer
-    params["option_type"]
-)
-st.success(f"The {params['option_type']} option price(according to given input parameters) is: ${price:.2f}")
+with stage("price"):
+    if params["tolerance"] is not None:
+        accurate = cached_call(
+            adaptive_price,
+            model="binomial",
+            S=float(params["S"]),
+            K=float(params["K"]),
+            T=float(params["T"]),
+            r=float(params["r"]),
+            sigma=float(params["sigma"]),
+            option_type=params["option_type"],
+            q=float(params["q"]),
+            exercise=params["exercise"],
+            tolerance=params["tolerance"]
+        )
+        price = accurate["price"]
+        # The other views follow the adaptive step count, capped like the slider so they never cost more than fixed steps
+        params["N"] = min(int(accurate["N"]), MAX_STEPS)
+    # In target-error mode the plain tree is only needed for the American early-exercise boundary
+    if params["tolerance"] is None or params["exercise"] == "american":
+        tree_price, boundary = cached_call(
+            binomial_model,
+            S=float(params["S"]),
+            K=float(params["K"]),
+            T=float(params["T"]),
+            r=float(params["r"]),
+            sigma=float(params["sigma"]),
+            N=int(params["N"]),  # Ensure N is an integer
+            option_type=params["option_type"],
+            q=float(params["q"]),
+            exercise=params["exercise"],
+            return_boundary=True
+        )
+        if params["tolerance"] is None:
+            price = tree_price
+if np.isnan(price):
+    st.error("The tree has no valid branch probabilities for these inputs (volatility too low for the rate and dividend yield at this step size). Increase the number of steps or the volatility.")
+    st.stop()
+st.success(f"The {params['exercise']} {params['option_type']} option price(according to given input parameters) is: ${price:.2f}")
+if params["tolerance"] is not None:
+    steps = int(accurate["N"])
+    st.caption(
+        f"Estimated error ±${accurate['error']:.4f} (target ${params['tolerance']:.4f}) from smoothed "
+        f"{steps // 4}-, {steps // 2}- and {steps}-step trees with Richardson extrapolation"
+        + ("" if accurate["converged"] else "; the target was not reached within the step limit")
+        + f". The ladder, Greeks and heatmap use {params['N']} steps"
+        + (f" (capped at {MAX_STEPS})." if steps > MAX_STEPS else ".")
+    )
+
+# Calls and puts across a strike ladder, all from one tree
+strikes = np.linspace(1 - params["ladder_width"] / 100, 1 + params["ladder_width"] / 100, params["ladder_strikes"]) * params["K"]
+with stage("ladder"):
+    ladder = cached_call(
+        binomial_ladder,
+        S=float(params["S"]),
+        K=tuple(strikes),
+        T=float(params["T"]),
+        r=float(params["r"]),
+        sigma=float(params["sigma"]),
+        N=int(params["N"]),
+        q=float(params["q"]),
+        exercise=params["exercise"]
+    )
+with st.expander("Strike Ladder"):
+    st.dataframe(
+        {"Strike (K)": np.round(strikes, 2), "Call": np.round(ladder["call"], 4), "Put": np.round(ladder["put"], 4)},
+        hide_index=True,
+        width="stretch"
+    )
+
+# Display Greeks
+with stage("greeks"):
+    greeks = cached_call(
+        binomial_greeks,
+        S=float(params["S"]),
+        K=float(params["K"]),
+        T=float(params["T"]),
+        r=float(params["r"]),
+        sigma=float(params["sigma"]),
+        N=int(params["N"]),
+        option_type=params["option_type"],
+        q=float(params["q"]),
+        exercise=params["exercise"]
+    )
+for column, name in zip(st.columns(5), ("delta", "gamma", "vega", "theta", "rho")):
+    column.metric(name.capitalize(), f"{greeks[name]:.4f}")
 
-# Generate and display heatmap
-fig = generate_heatmap(
+if params["exercise"] == "american":
+    with st.expander("Early-Exercise Boundary"):
+        st.line_chart(
+            {"Time (years)": np.linspace(0, params["T"], params["N"] + 1), "Critical Stock Price": boundary},
+            x="Time (years)",
+            y="Critical Stock Price"
+        )
+
+# Price the heatmap in the background, coarse to fine, and draw it as it fills in
+job, row_values, sigma_range = start_heatmap(
     float(params["S_min"]),
     float(params["S_max"]),
     float(params["sigma_min"]),
     float(params["sigma_max"]),
+    float(params["S"]),
     float(params["K"]),
     float(params["T"]),
     float(params["r"]),
-    float(params["sigma"]),  # Missing sigma argument added
-    int(params["N"]),        # Ensure N is an integer
-    params["option_type"]    # Add this missing argument
+    int(params["N"]),
+    params["option_type"],
+    float(params["q"]),
+    params["exercise"],
+    greek=params["heatmap_value"],
+    rows=params["heatmap_rows"],
+    cols=params["heatmap_cols"],
+    engine=params["heatmap_engine"],
+    K_range=params["K_range"]
+)
+st.fragment(show_heatmap, run_every=None if job.done else 0.5)(
+    job,
+    row_values,
+    sigma_range,
+    params["heatmap_value"],
+    strike_rows=params["K_range"] is not None,
+    polling=not job.done
 )
-st.pyplot(fig)
+# The heatmap is priced on a worker thread; its timings and counters join this run's once it has finished
+job.report()
+
+cache_stats = default_cache.stats()
+st.caption(
+    f"Price cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+    f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['size']}/{cache_stats['maxsize']} entries, "
+    f"{cache_stats['evictions']} evictions"
+)
+
+if recorder:
+    show_performance_panel(recorder.stop(), "binomial")
 
 # Additional information
 st.markdown("""---""")
@@ -0,0 +1,140 @@
+import os
+
+import streamlit as st
+import numpy as np
+
+from performance_panel import show_performance_panel
+from pricing import cached_call, monte_carlo
+from pricing.instrument import stage, start_recording
+from pricing.monte_carlo import BARRIER_TYPES, PAYOFFS, gbm_paths
+
+# Page configuration
+st.set_page_config(
+    page_title="Monte Carlo Simulation Model",
+    page_icon="📈",
+    menu_items={"Get Help": None, "Report a Bug": None, "About": None}
+)
+
+if st.sidebar.button("🏠 Home", use_container_width=True):
+    st.switch_page("app.py")
+
+def create_sidebar():
+    # Navigation
+    selected_model = st.sidebar.selectbox(
+        "Navigate to",
+        ["Black Scholes Option Pricing Model", "Binomial Options Pricing Model", "Trinomial Options Pricing Model", "Monte Carlo Simulation Model", "Portfolio Scenario Analysis"],
+        index=3
+    )
+
+    if selected_model == "Black Scholes Option Pricing Model":
+        st.switch_page("pages/1_black-scholes-model.py")
+    elif selected_model == "Binomial Options Pricing Model":
+        st.switch_page("pages/2_binomial-model.py")
+    elif selected_model == "Trinomial Options Pricing Model":
+        st.switch_page("pages/3_trinomial-model.py")
+    elif selected_model == "Portfolio Scenario Analysis":
+        st.switch_page("pages/5_scenario-analysis.py")
+
+    # Initialize parameters dictionary
+    params = {}
+
+    # Model Parameters
+    st.sidebar.header("Model Parameters")
+    params["S"] = st.sidebar.number_input("Current Stock Price (S)", min_value=0.01, value=100.0)
+    params["K"] = st.sidebar.number_input("Strike Price (K)", min_value=0.01, value=100.0)
+    params["T"] = st.sidebar.number_input("Time to Maturity (T in years)", min_value=0.01, value=1.0)
+    params["r"] = st.sidebar.number_input("Risk-Free Interest Rate (r as decimal)", min_value=0.0, value=0.05)
+    params["sigma"] = st.sidebar.number_input("Volatility (σ as decimal)", min_value=0.01, value=0.2)
+    params["q"] = st.sidebar.number_input("Dividend Yield (q as decimal)", min_value=0.0, value=0.0)
+    params["option_type"] = st.sidebar.radio("Option Type", ("call", "put"))
+
+    # Payoff
+    st.sidebar.header("Payoff")
+    params["payoff"] = st.sidebar.selectbox("Payoff Type", PAYOFFS)
+    params["barrier"] = None
+    params["barrier_type"] = "up-and-out"
+    if params["payoff"] == "barrier":
+        params["barrier_type"] = st.sidebar.selectbox("Barrier Type", BARRIER_TYPES)
+        default_barrier = params["S"] * (1.2 if params["barrier_type"].startswith("up") else 0.8)
+        params["barrier"] = st.sidebar.number_input("Barrier Level", min_value=0.01, value=default_barrier)
+    params["steps"] = int(st.sidebar.slider("Monitoring Dates per Path", min_value=1, max_value=365, value=252))
+
+    # Simulation Configuration
+    st.sidebar.header("Simulation Configuration")
+    params["paths"] = int(st.sidebar.number_input("Maximum Number of Paths", min_value=1_000, max_value=10_000_000, value=200_000, step=10_000))
+    params["chunk_size"] = int(st.sidebar.number_input("Paths per Chunk", min_value=1_000, max_value=200_000, value=20_000, step=1_000))
+    params["antithetic"] = st.sidebar.checkbox("Antithetic Variates", value=True)
+    params["control_variate"] = st.sidebar.checkbox("Control Variate", value=True, help="The discounted European payoff, with its Black-Scholes price as the known mean; European options use the discounted final stock price instead")
+    tol = st.sidebar.number_input("Target Standard Error (0 = run all paths)", min_value=0.0, value=0.0, step=0.001, format="%.4f")
+    params["tol"] = tol if tol > 0 else None
+    params["seed"] = int(st.sidebar.number_input("Random Seed", min_value=0, value=0))
+    params["workers"] = int(st.sidebar.number_input("Worker Processes", min_value=1, max_value=os.cpu_count() or 1, value=1))
+
+    # Performance Instrumentation
+    st.sidebar.header("Performance")
+    params["show_performance"] = st.sidebar.checkbox("Show Performance Panel", value=False)
+    params["track_allocations"] = st.sidebar.checkbox("Track Allocations (slower)", value=False, disabled=not params["show_performance"])
+
+    return params
+
+st.title("Monte Carlo Option Pricing Calculator")
+
+st.markdown("""***Monte Carlo simulation prices an option by simulating many possible paths of the underlying asset under the risk-neutral measure and averaging the discounted payoffs. Because it works path by path, it can price path-dependent options such as Asian, barrier and lookback options.***""")
+
+params = create_sidebar()
+show_performance, track_allocations = params.pop("show_performance"), params.pop("track_allocations")
+recorder = start_recording(show_performance, track_allocations)
+
+with stage("price"):
+    result = cached_call(monte_carlo, **params)
+
+st.success(
+    f"The {params['payoff']} {params['option_type']} option price(according to given input parameters) is: "
+    f"${result['price']:.4f} ± {result['std_error']:.4f} (standard error)"
+)
+st.caption(f"Simulated {result['paths']:,} paths in chunks of {params['chunk_size']:,}.")
+
+# Sample paths for illustration
+with stage("sample_paths"):
+    sample_paths = gbm_paths(
+        params["S"],
+        params["T"],
+        params["r"],
+        params["sigma"],
+        np.random.default_rng(params["seed"]).standard_normal((20, params["steps"])),
+        params["q"]
+    )
+st.subheader("Sample Simulated Paths")
+st.line_chart(sample_paths.T)
+
+if recorder:
+    show_performance_panel(recorder.stop(), "monte-carlo")
+
+st.markdown("""---""")
+st.subheader(""" ***Assumptions of the Monte Carlo Model*** """)
+
+st.markdown("""
+- **Geometric Brownian Motion:** The underlying asset price follows a geometric Brownian motion with constant drift and volatility.
+- **Risk-Neutral Valuation:** Paths are simulated under the risk-neutral measure and payoffs are discounted at the risk-free rate.
+- **Discrete Monitoring:** Path-dependent features (averages, barriers, extremes) are observed only on the simulated monitoring dates.
+- **Sampling Error:** The price is an estimate; its standard error shrinks with the square root of the number of paths and is reduced further by antithetic and control variates.
+- **European Exercise:** Options are exercised only at maturity.
+""")
+
+st.markdown("""---""")
+st.markdown("""
+**About Me**  
+Sri Sahithi Sunkaranam | [LinkedIn](https://www.linkedin.com/in/sri-sahithi-sunkaranam) | [GitHub](https://github.com/sahithi-sss)
+""")
+
+st.markdown("""
+    <style>
+        [data-testid="collapsedControl"] {display: none}
+        section[data-testid="stSidebar"] > div:first-child {display: none}
+        .main > div:first-child {display: none}
+        button[kind="headerNoPadding"] {display: none}
+        .st-emotion-cache-1dp5vir {display: none}
+        [data-testid="stSidebarNav"] {display: none !important}
+        .st-emotion-cache-16pwjcz {display: none}
+    </style>
+""", unsafe_allow_html=True)
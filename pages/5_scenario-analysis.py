@@ -0,0 +1,251 @@
+import csv
+import hashlib
+import io
+import os
+
+import streamlit as st
+import numpy as np
+
+from heatmaps import render_heatmap
+from performance_panel import show_performance_panel
+from pricing import default_cache, option_sign
+from pricing.cache import make_key
+from pricing.instrument import count, stage, start_recording
+from pricing.scenarios import scenario_pnl
+
+# Page configuration
+st.set_page_config(
+    page_title="Portfolio Scenario Analysis",
+    page_icon="📈",
+    menu_items={"Get Help": None, "Report a Bug": None, "About": None}
+)
+
+if st.sidebar.button("🏠 Home", use_container_width=True):
+    st.switch_page("app.py")
+
+def demo_portfolio(positions, seed=0):
+    # Random book of calls and puts around a 100 spot, long and short
+    rng = np.random.default_rng(seed)
+    return {
+        "S": np.full(positions, 100.0),
+        "K": rng.choice(np.arange(70.0, 135.0, 5.0), positions),
+        "T": rng.choice([0.08, 0.25, 0.5, 1.0, 2.0], positions),
+        "r": np.full(positions, 0.05),
+        "sigma": rng.uniform(0.15, 0.35, positions),
+        "option_type": np.where(rng.random(positions) < 0.5, "call", "put"),
+        "quantity": rng.integers(-50, 51, positions).astype(float),
+    }
+
+def read_portfolio(uploaded_file):
+    # CSV with S, K, T, r, sigma and optional option_type, q and quantity columns
+    rows = list(csv.DictReader(io.TextIOWrapper(uploaded_file, encoding="utf-8")))
+    portfolio = {}
+    for name in ("S", "K", "T", "r", "sigma", "q", "quantity"):
+        if name in rows[0]:
+            portfolio[name] = np.array([float(row[name]) for row in rows])
+    if "option_type" in rows[0]:
+        # Call flags; unknown option types raise ValueError instead of being valued as puts
+        portfolio["option_type"] = option_sign([row["option_type"] for row in rows]) > 0
+    return portfolio
+
+def portfolio_digest(portfolio):
+    # Content digest, so the scenario grid can be cached on the portfolio without hashing arrays on every lookup
+    h = hashlib.blake2b(digest_size=16)
+    for name in sorted(portfolio):
+        values = np.ascontiguousarray(portfolio[name])
+        h.update(f"{name}:{values.dtype.str}:{values.shape}".encode())
+        h.update(values.tobytes())
+    return h.hexdigest()
+
+def parse_shocks(text):
+    return [float(value) for value in text.split(",") if value.strip()]
+
+def generate_heatmap(pnl, spot_shocks, vol_shocks):
+    return render_heatmap(
+        pnl,
+        [f"{shock:+.0%}" for shock in spot_shocks],
+        [f"{shock:+.2f}" for shock in vol_shocks],
+        title="Portfolio P&L by Scenario",
+        xlabel="Volatility Shock (absolute)",
+        ylabel="Spot Shock",
+        fmt=",.0f",
+        cmap="RdYlGn",
+        center=0
+    )
+
+def create_sidebar():
+    # Navigation
+    selected_model = st.sidebar.selectbox(
+        "Navigate to",
+        ["Black Scholes Option Pricing Model", "Binomial Options Pricing Model", "Trinomial Options Pricing Model", "Monte Carlo Simulation Model", "Portfolio Scenario Analysis"],
+        index=4
+    )
+
+    if selected_model == "Black Scholes Option Pricing Model":
+        st.switch_page("pages/1_black-scholes-model.py")
+    elif selected_model == "Binomial Options Pricing Model":
+        st.switch_page("pages/2_binomial-model.py")
+    elif selected_model == "Trinomial Options Pricing Model":
+        st.switch_page("pages/3_trinomial-model.py")
+    elif selected_model == "Monte Carlo Simulation Model":
+        st.switch_page("pages/4_monte-carlo-model.py")
+
+    # Initialize parameters dictionary
+    params = {}
+
+    # Portfolio
+    st.sidebar.header("Portfolio")
+    params["portfolio_file"] = st.sidebar.file_uploader("Portfolio CSV (S, K, T, r, sigma, option_type, q, quantity)", type="csv")
+    params["positions"] = int(st.sidebar.number_input("Demo Portfolio Positions", min_value=1, max_value=100_000, value=1_000, step=100))
+
+    # Pricing Model
+    st.sidebar.header("Pricing Model")
+    params["model"] = st.sidebar.selectbox("Model", ("black-scholes", "binomial", "trinomial"))
+    params["N"] = 100
+    params["exercise"] = "european"
+    if params["model"] != "black-scholes":
+        params["N"] = int(st.sidebar.slider("Number of N in Tree", min_value=10, max_value=500, value=50))
+        params["exercise"] = st.sidebar.radio("Exercise Style", ("european", "american"))
+
+    # Shocks
+    st.sidebar.header("Shocks")
+    spot_range = st.sidebar.slider("Spot Shock Range (%)", min_value=-50, max_value=50, value=(-20, 20))
+    spot_steps = int(st.sidebar.slider("Spot Shock Steps", min_value=2, max_value=41, value=11))
+    vol_range = st.sidebar.slider("Volatility Shock Range (absolute)", min_value=-0.3, max_value=0.3, value=(-0.1, 0.1), step=0.01)
+    vol_steps = int(st.sidebar.slider("Volatility Shock Steps", min_value=2, max_value=41, value=11))
+    params["spot"] = np.linspace(spot_range[0] / 100, spot_range[1] / 100, spot_steps)
+    params["vol"] = np.linspace(vol_range[0], vol_range[1], vol_steps)
+    params["rate"] = st.sidebar.text_input("Rate Shocks (comma-separated decimals)", value="0.0, 0.01")
+    params["days"] = st.sidebar.text_input("Days Elapsed (comma-separated)", value="0, 30")
+
+    # Execution
+    st.sidebar.header("Execution")
+    params["memory_budget"] = int(st.sidebar.number_input("Memory Budget (MB)", min_value=8, max_value=16_384, value=256)) * 2**20
+    params["workers"] = int(st.sidebar.number_input("Worker Processes", min_value=1, max_value=os.cpu_count() or 1, value=1))
+
+    # Performance Instrumentation
+    st.sidebar.header("Performance")
+    params["show_performance"] = st.sidebar.checkbox("Show Performance Panel", value=False)
+    params["track_allocations"] = st.sidebar.checkbox("Track Allocations (slower)", value=False, disabled=not params["show_performance"])
+
+    return params
+
+st.title("Portfolio Scenario Analysis")
+
+st.markdown("""***Scenario analysis revalues every position of a portfolio under joint shocks to the spot price, volatility, interest rate and the passage of time, and reports the profit or loss of the whole book in each scenario.***""")
+
+params = create_sidebar()
+recorder = start_recording(params["show_performance"], params["track_allocations"])
+
+try:
+    rate_shocks = parse_shocks(params["rate"]) or [0.0]
+    day_shocks = parse_shocks(params["days"]) or [0.0]
+except ValueError:
+    st.error("Rate shocks and days elapsed must be comma-separated numbers.")
+    st.stop()
+
+if params["portfolio_file"] is not None:
+    try:
+        portfolio = read_portfolio(params["portfolio_file"])
+        missing = [name for name in ("S", "K", "T", "r", "sigma") if name not in portfolio]
+        if missing:
+            raise ValueError(f"missing column(s): {', '.join(missing)}")
+    except (ValueError, KeyError, IndexError) as error:
+        st.error(f"Could not read the portfolio: {error}")
+        st.stop()
+else:
+    portfolio = demo_portfolio(params["positions"])
+
+# Cached on the portfolio and every input, so moving the rate / time slice sliders only changes the slice shown
+settings = dict(
+    spot=tuple(params["spot"].tolist()),
+    vol=tuple(params["vol"].tolist()),
+    rate=tuple(rate_shocks),
+    days=tuple(day_shocks),
+    model=params["model"],
+    N=params["N"],
+    exercise=params["exercise"],
+    memory_budget=params["memory_budget"],
+    workers=params["workers"]
+)
+scenario_key = make_key(scenario_pnl, portfolio=portfolio_digest(portfolio), **settings)
+result = default_cache.get(scenario_key)
+if result is None:
+    count("cache_misses")
+    with stage("scenarios"):
+        result = scenario_pnl(portfolio, **settings)
+    default_cache.set(scenario_key, result)
+else:
+    count("cache_hits")
+
+pnl = result["pnl"]
+columns = st.columns(3)
+columns[0].metric("Portfolio Value", f"${result['base_value']:,.2f}")
+columns[1].metric("Worst Scenario P&L", f"${pnl.min():,.2f}")
+columns[2].metric("Best Scenario P&L", f"${pnl.max():,.2f}")
+st.caption(
+    f"{len(portfolio['S']):,} positions x {pnl.size:,} scenarios = {result['evaluations']:,} evaluations "
+    f"in {result['tiles']:,} tiles of up to {result['tile_size']:,} contracts"
+)
+
+# Pick the rate / time slice to show as a spot x vol heatmap
+rate_index = 0
+day_index = 0
+if len(rate_shocks) > 1:
+    rate_index = rate_shocks.index(st.select_slider("Rate Shock", options=rate_shocks))
+if len(day_shocks) > 1:
+    day_index = day_shocks.index(st.select_slider("Days Elapsed", options=day_shocks))
+
+with stage("heatmap/render"):
+    image, caption = generate_heatmap(pnl[:, :, rate_index, day_index], result["axes"]["spot"], result["axes"]["vol"])
+with stage("heatmap/display"):
+    st.image(image, caption=caption, width="stretch", output_format="PNG")
+
+st.subheader("Worst Scenarios")
+worst = np.argsort(pnl, axis=None)[:10]
+st.dataframe(
+    [
+        {
+            "Spot Shock": f"{result['axes']['spot'][i]:+.1%}",
+            "Vol Shock": f"{result['axes']['vol'][j]:+.2f}",
+            "Rate Shock": f"{result['axes']['rate'][k]:+.4f}",
+            "Days Elapsed": result["axes"]["days"][l],
+            "P&L": round(pnl[i, j, k, l], 2),
+        }
+        for i, j, k, l in zip(*np.unravel_index(worst, pnl.shape))
+    ],
+    hide_index=True,
+    width="stretch"
+)
+
+if recorder:
+    show_performance_panel(recorder.stop(), "scenario-analysis")
+
+st.markdown("""---""")
+st.subheader(""" ***Assumptions of the Scenario Analysis*** """)
+
+st.markdown("""
+- **Full Revaluation:** Every position is repriced with the chosen model in every scenario rather than approximated with Greeks.
+- **Joint Shocks:** Spot shocks are relative moves, volatility and rate shocks are absolute moves, and all combinations are evaluated.
+- **Time Decay:** Days elapsed shorten each option's time to maturity; options that expire within the horizon are worth their intrinsic value.
+- **Static Portfolio:** Positions are held unchanged across scenarios, with no hedging or rebalancing.
+- **Volatility Floor:** Shocked volatilities are floored at 1%, and on the lattices at the lowest level that keeps the tree's branch probabilities valid.
+""")
+
+st.markdown("""---""")
+st.markdown("""
+**About Me**
+Sri Sahithi Sunkaranam | [LinkedIn](https://www.linkedin.com/in/sri-sahithi-sunkaranam) | [GitHub](https://github.com/sahithi-sss)
+""")
+
+st.markdown("""
+    <style>
+        [data-testid="collapsedControl"] {display: none}
+        section[data-testid="stSidebar"] > div:first-child {display: none}
+        .main > div:first-child {display: none}
+        button[kind="headerNoPadding"] {display: none}
+        .st-emotion-cache-1dp5vir {display: none}
+        [data-testid="stSidebarNav"] {display: none !important}
+        .st-emotion-cache-16pwjcz {display: none}
+    </style>
+""", unsafe_allow_html=True)
@@ -0,0 +1,31 @@
+"""Performance panel shared by the Streamlit pages."""
+
+import os
+
+import streamlit as st
+
+
+def show_performance_panel(recorder, page):
+    """Stage timings, counters and a metrics download for ``page`` from a stopped ``Recorder``."""
+    records = recorder.records(page=page)
+    with st.expander("Performance"):
+        st.dataframe(
+            [
+                {
+                    "Stage": record["name"],
+                    "Calls": record["calls"],
+                    "Time (ms)": round(record["seconds"] * 1e3, 2),
+                    "Peak Allocated (KiB)": None if record["peak_bytes"] is None else round(record["peak_bytes"] / 1024, 1),
+                }
+                for record in records if record["kind"] == "stage"
+            ],
+            hide_index=True,
+            width="stretch"
+        )
+        counters = [record for record in records if record["kind"] == "counter"]
+        for column, record in zip(st.columns(max(len(counters), 1)), counters):
+            column.metric(record["name"].replace("_", " ").capitalize(), f"{record['value']:,}")
+        st.download_button("Download Metrics (JSON Lines)", recorder.to_jsonl(page=page), file_name=f"{page}-metrics.jsonl", mime="application/json")
+    # Append to a metrics file for offline analysis when one is configured
+    if os.environ.get("PRICING_METRICS_FILE"):
+        recorder.write_jsonl(os.environ["PRICING_METRICS_FILE"], page=page)
@@ -0,0 +1,245 @@
+"""Batch-price option chains from CSV or Parquet files.
+
+Reads the input in fixed-size chunks, prices each chunk with one of the
+vectorized engines on a process pool and writes the results incrementally,
+so files larger than RAM stream through in bounded memory.
+
+    python price_chain.py chain.csv priced.csv --model binomial --steps 200 --workers 4
+
+Input columns: S, K, T, r, sigma and optionally option_type ("call"/"put"
+or "c"/"p", in any case) and q. Output is the input with a ``price`` column appended, plus delta,
+gamma, vega, theta and rho columns with ``--greeks``.
+"""
+
+import argparse
+import csv
+import os
+import resource
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pricing import (
+    binomial_greeks,
+    binomial_model,
+    black_scholes,
+    black_scholes_greeks,
+    option_sign,
+    trinomial_greeks,
+    trinomial_model,
+)
+
+REQUIRED_COLUMNS = ("S", "K", "T", "r", "sigma")
+GREEK_COLUMNS = ("price", "delta", "gamma", "vega", "theta", "rho")
+
+# model -> (price engine, Greeks engine)
+ENGINES = {
+    "black-scholes": (black_scholes, black_scholes_greeks),
+    "binomial": (binomial_model, binomial_greeks),
+    "trinomial": (trinomial_model, trinomial_greeks),
+}
+
+
+def price_chunk(model, steps, exercise, default_option_type, greeks, columns):
+    """Price one chunk of contracts given as a dict of column arrays.
+
+    Returns a dict of output columns: ``price``, plus the Greeks if requested.
+    """
+    option_type = columns.get("option_type", default_option_type)
+    inputs = [columns[name] for name in REQUIRED_COLUMNS]
+    engine = ENGINES[model][1 if greeks else 0]
+    if model == "black-scholes":
+        result = engine(*inputs, option_type, columns.get("q", 0.0))
+    else:
+        result = engine(*inputs, steps, option_type, columns.get("q", 0.0), exercise)
+    if not greeks:
+        result = {"price": result}
+    return {name: np.atleast_1d(result[name]) for name in GREEK_COLUMNS if name in result}
+
+
+def _call_flags(values):
+    # Case-insensitive call/put (or c/p) -> True for calls; anything else is rejected rather than priced as a put
+    return option_sign(values) > 0
+
+
+def _file_format(path, override):
+    if override:
+        return override
+    return "parquet" if path.endswith((".parquet", ".pq")) else "csv"
+
+
+def _read_csv(path, chunk_size):
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        missing = [name for name in REQUIRED_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"{path} is missing required columns: {', '.join(missing)}")
+        rows = []
+        for row in reader:
+            rows.append(row)
+            if len(rows) == chunk_size:
+                yield header, rows
+                rows = []
+        if rows:
+            yield header, rows
+
+
+def _csv_columns(chunk):
+    header, rows = chunk
+    fields = dict(zip(header, zip(*rows)))
+    columns = {name: np.array(fields[name], dtype=float) for name in REQUIRED_COLUMNS}
+    if "q" in fields:
+        columns["q"] = np.array(fields["q"], dtype=float)
+    if "option_type" in fields:
+        columns["option_type"] = _call_flags(fields["option_type"])
+    return columns
+
+
+def _read_parquet(path, chunk_size):
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        missing = [name for name in REQUIRED_COLUMNS if name not in batch.schema.names]
+        if missing:
+            raise ValueError(f"{path} is missing required columns: {', '.join(missing)}")
+        yield batch
+
+
+def _parquet_columns(batch):
+    columns = {name: batch.column(name).to_numpy(zero_copy_only=False).astype(float) for name in REQUIRED_COLUMNS}
+    if "q" in batch.schema.names:
+        columns["q"] = batch.column("q").to_numpy(zero_copy_only=False).astype(float)
+    if "option_type" in batch.schema.names:
+        columns["option_type"] = _call_flags(batch.column("option_type").to_numpy(zero_copy_only=False))
+    return columns
+
+
+class _CsvWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._header_written = False
+
+    def write(self, chunk, results):
+        header, rows = chunk
+        if not self._header_written:
+            self._writer.writerow(header + list(results))
+            self._header_written = True
+        values = zip(*(np.char.mod("%.10g", column) for column in results.values()))
+        self._writer.writerows(row + list(extra) for row, extra in zip(rows, values))
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path):
+        self._path = path
+        self._writer = None
+
+    def write(self, batch, results):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        for name, values in results.items():
+            batch = batch.append_column(name, pa.array(values))
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._path, batch.schema)
+        self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _peak_memory_mb(who):
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run(args):
+    input_format = _file_format(args.input, args.input_format)
+    output_format = _file_format(args.output, args.output_format)
+    if input_format != output_format:
+        raise ValueError("input and output must use the same format")
+
+    if input_format == "csv":
+        chunks = _read_csv(args.input, args.chunk_size)
+        to_columns = _csv_columns
+        writer = _CsvWriter(args.output)
+    else:
+        chunks = _read_parquet(args.input, args.chunk_size)
+        to_columns = _parquet_columns
+        writer = _ParquetWriter(args.output)
+
+    pool = ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    # Keep a bounded number of chunks in flight so memory stays flat however large the file is
+    pending = deque()
+    max_pending = 2 * max(args.workers, 1)
+    rows_done = 0
+    start = time.perf_counter()
+
+    def submit(chunk):
+        job = (args.model, args.steps, args.exercise, args.option_type, args.greeks, to_columns(chunk))
+        result = pool.submit(price_chunk, *job) if pool else price_chunk(*job)
+        pending.append((chunk, result))
+
+    def drain_one():
+        nonlocal rows_done
+        chunk, result = pending.popleft()
+        results = result.result() if pool else result
+        writer.write(chunk, results)
+        rows_done += len(results["price"])
+        if args.progress:
+            elapsed = time.perf_counter() - start
+            print(f"{rows_done:,} rows, {rows_done / elapsed:,.0f} rows/s", file=sys.stderr)
+
+    try:
+        for chunk in chunks:
+            submit(chunk)
+            while len(pending) >= max_pending:
+                drain_one()
+        while pending:
+            drain_one()
+    finally:
+        writer.close()
+        if pool:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Priced {rows_done:,} rows in {elapsed:.2f} s ({rows_done / max(elapsed, 1e-9):,.0f} rows/s); "
+        f"peak RSS {_peak_memory_mb(resource.RUSAGE_SELF):.0f} MB (main), "
+        f"{_peak_memory_mb(resource.RUSAGE_CHILDREN):.0f} MB (largest worker)",
+        file=sys.stderr,
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="input CSV or Parquet file")
+    parser.add_argument("output", help="output file, in the same format as the input")
+    parser.add_argument("--model", choices=("black-scholes", "binomial", "trinomial"), default="black-scholes")
+    parser.add_argument("--steps", type=int, default=100, help="lattice steps N (binomial/trinomial)")
+    parser.add_argument("--exercise", choices=("european", "american"), default="european")
+    parser.add_argument("--option-type", choices=("call", "put"), default="call",
+                        help="used when the input has no option_type column")
+    parser.add_argument("--greeks", action="store_true", help="also write delta, gamma, vega, theta and rho")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="rows per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (1 = no pool)")
+    parser.add_argument("--input-format", choices=("csv", "parquet"), help="override format detection")
+    parser.add_argument("--output-format", choices=("csv", "parquet"), help="override format detection")
+    parser.add_argument("--progress", action="store_true", help="report throughput after every chunk")
+    args = parser.parse_args(argv)
+    if args.model == "black-scholes" and args.exercise == "american":
+        parser.error("Black-Scholes only prices European options")
+    return args
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,52 @@
+"""Headless option pricing engines.
+
+The Streamlit pages, batch jobs and services all price through this package.
+Nothing here imports Streamlit, matplotlib or seaborn, and the engine modules
+(and NumPy/SciPy behind them) are only loaded on first use, so ``import pricing``
+is cheap enough for short-lived worker processes.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "adaptive_price": "adaptive",
+    "black_scholes": "bsm",
+    "black_scholes_greeks": "bsm",
+    "binomial_model": "binomial",
+    "binomial_greeks": "binomial",
+    "binomial_ladder": "binomial",
+    "trinomial_model": "trinomial",
+    "trinomial_greeks": "trinomial",
+    "trinomial_ladder": "trinomial",
+    "crank_nicolson": "finite_difference",
+    "finite_difference_grid": "finite_difference",
+    "implied_volatility": "implied_vol",
+    "monte_carlo": "monte_carlo",
+    "option_sign": "_batch",
+    "PriceSurface": "surface",
+    "ProgressiveGrid": "progressive",
+    "Recorder": "instrument",
+    "scenario_pnl": "scenarios",
+    "shock_grid": "scenarios",
+    "build_surface": "surface",
+    "ensure_surface": "surface",
+    "PriceCache": "cache",
+    "cached_call": "cache",
+    "cached_grid": "cache",
+    "default_cache": "cache",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
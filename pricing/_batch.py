@@ -0,0 +1,68 @@
+"""Helpers shared by the engines for batching inputs and validating arguments."""
+
+import numpy as np
+
+# Bump sizes for the finite-difference vega and rho of the lattice engines
+SIGMA_BUMP = 1e-2
+RATE_BUMP = 1e-4
+# Accepted option type names, matched case-insensitively
+OPTION_TYPES = ("call", "put", "c", "p")
+
+
+def option_sign(option_type):
+    """+1 for calls and -1 for puts, from call/put (or c/p) strings in any case or boolean call flags.
+
+    Any other string raises ValueError rather than being priced as a put.
+    """
+    option_type = np.asarray(option_type)
+    if option_type.dtype == bool:
+        return np.where(option_type, 1.0, -1.0)
+    names = np.char.lower(np.char.strip(option_type.astype(str)))
+    unknown = np.unique(names[~np.isin(names, OPTION_TYPES)])
+    if unknown.size:
+        raise ValueError(f"option_type must be call/put or c/p, got {', '.join(map(repr, unknown[:5].tolist()))}")
+    return np.where(np.isin(names, ("call", "c")), 1.0, -1.0)
+
+
+def flatten_batch(*arrays):
+    """Broadcast the inputs together and flatten them to 1-D float arrays.
+
+    Returns the broadcast shape followed by the flattened arrays.
+    """
+    arrays = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in arrays))
+    return (arrays[0].shape, *(x.reshape(-1) for x in arrays))
+
+
+def restore_batch(values, shape):
+    """Reshape a flat batch result back to ``shape``, unwrapping scalars to Python numbers."""
+    values = np.reshape(values, shape)
+    return values if values.ndim else values.item()
+
+
+def check_exercise(exercise):
+    """Validate an exercise style, returning True for American exercise."""
+    if exercise not in ("european", "american"):
+        raise ValueError(f"exercise must be 'european' or 'american', got {exercise!r}")
+    return exercise == "american"
+
+
+def sigma_bumps(sigma):
+    """Bumped-up and bumped-down volatilities for the finite-difference vega.
+
+    Central bumps of ``SIGMA_BUMP``, except that volatilities below twice the
+    bump are not bumped down (a forward difference), so the down bump never
+    reaches zero or negative volatility. Divide by ``up - down``.
+    """
+    return sigma + SIGMA_BUMP, np.where(sigma < 2 * SIGMA_BUMP, sigma, sigma - SIGMA_BUMP)
+
+
+def bump_batch(S, K, T, r, sigma, q, sign):
+    """Stack the flat batch five times: base, sigma up/down and rate up/down.
+
+    Lets a lattice price the vega and rho bumps in the same rollback as the base
+    contracts; split the results with ``values.reshape(5, -1)``.
+    """
+    sigma_all = np.concatenate([sigma, *sigma_bumps(sigma), sigma, sigma])
+    r_all = np.concatenate([r, r, r, r + RATE_BUMP, r - RATE_BUMP])
+    S_all, K_all, T_all, q_all, sign_all = (np.tile(x, 5) for x in (S, K, T, q, sign))
+    return S_all, K_all, T_all, r_all, sigma_all, q_all, sign_all
@@ -0,0 +1,76 @@
+"""Lattice prices to a target accuracy instead of a fixed number of steps.
+
+A plain binomial or trinomial price converges like 1/N but oscillates with the
+parity of N and the position of the strike relative to the nodes, so neither
+the error nor a good N can be read off a single tree. Replacing the last step
+of the tree with Black-Scholes values (Broadie-Detemple smoothing) makes the
+convergence smooth and monotone, and Richardson extrapolation of two smoothed
+trees, 2 * P(2N) - P(N), then cancels the leading error term:
+
+    P(N), P(2N), P(4N), ...  ->  R(2N) = 2 P(2N) - P(N),  R(4N) = 2 P(4N) - P(2N), ...
+
+The difference between successive extrapolations estimates the error of the
+coarser one. Extrapolation cannot cancel the part of the error that depends
+on where the strike falls between nodes, so a tenth of the difference between
+the smoothed trees themselves is added as a margin; on random European
+contracts this bounds the actual error about 98% of the time (less often for
+American ones, whose exercise boundary adds an irregular error of its own).
+The step count keeps doubling until the estimate is within the tolerance.
+"""
+
+import numpy as np
+
+from . import binomial, trinomial
+from ._batch import check_exercise, flatten_batch, option_sign, restore_batch
+from .instrument import count
+
+ENGINES = {"binomial": binomial._rollback, "trinomial": trinomial._rollback}
+# Share of the difference between successive smoothed trees added to the error estimate
+NODE_MARGIN = 0.1
+
+
+def adaptive_price(model, S, K, T, r, sigma, option_type="call", q=0.0, exercise="european", tolerance=0.01,
+                   start_steps=25, max_steps=3200):
+    """Smoothed, Richardson-extrapolated lattice price with an error estimate.
+
+    ``model`` is "binomial" or "trinomial". Starting from ``start_steps``, the
+    step count doubles (up to ``max_steps``) until the estimated absolute error
+    of each contract is at most ``tolerance``; contracts that have converged
+    drop out of the batch. Inputs broadcast like ``binomial_model``.
+
+    Returns a dict with ``price``, the error estimate ``error``, the finest step
+    count ``N`` used and whether the contract ``converged`` within tolerance.
+    """
+    if model not in ENGINES:
+        raise ValueError(f"model must be one of {tuple(ENGINES)}, got {model!r}")
+    rollback = ENGINES[model]
+    shape, S, K, T, r, sigma, q, sign = flatten_batch(S, K, T, r, sigma, q, option_sign(option_type))
+    american = check_exercise(exercise)
+
+    def smoothed(N, index):
+        return rollback(S[index], K[index], T[index], r[index], sigma[index], q[index], sign[index], N, american,
+                        smooth=True)[0]
+
+    price = np.full(S.size, np.nan)
+    error = np.full(S.size, np.inf)
+    steps = np.zeros(S.size, dtype=int)
+
+    active = np.arange(S.size)
+    N = max(start_steps, 2)
+    coarse = smoothed(N, active)
+    previous = None
+    while active.size and 2 * N <= max_steps:
+        N *= 2
+        fine = smoothed(N, active)
+        extrapolated = 2 * fine - coarse
+        if previous is not None:
+            error[active] = np.abs(extrapolated - previous) + NODE_MARGIN * np.abs(fine - coarse)
+        price[active] = extrapolated
+        steps[active] = N
+        # Only the contracts still outside the tolerance go on to the next, doubled step count
+        remaining = ~(error[active] <= tolerance)
+        active, coarse, previous = active[remaining], fine[remaining], extrapolated[remaining]
+    count("adaptive_contracts", S.size)
+
+    results = {"price": price, "error": error, "N": steps, "converged": error <= tolerance}
+    return {name: restore_batch(values, shape) for name, values in results.items()}
@@ -0,0 +1,198 @@
+"""Binomial (Cox-Ross-Rubinstein) lattice pricing."""
+
+import numpy as np
+
+from ._batch import RATE_BUMP, bump_batch, check_exercise, flatten_batch, option_sign, restore_batch, sigma_bumps
+from .instrument import count, stage
+
+# Fewest steps for the Greeks: the rollback only keeps the step-2 nodes when it passes step 3
+GREEKS_MIN_STEPS = 3
+
+
+def _rollback(S, K, T, r, sigma, q, sign, N, american, return_boundary=False, keep_steps=0, smooth=False):
+    """Roll a flat batch of contracts back to the root of the tree.
+
+    With ``smooth`` the values at step N - 1 are Black-Scholes prices over the
+    last time step (Broadie-Detemple smoothing), which removes the odd/even
+    oscillation of the plain tree. Returns the root values, the early-exercise
+    boundary (NaN unless requested) and a list with copies of the value vectors
+    at steps 1..keep_steps.
+    """
+    with stage("binomial/build"):
+        dt = T / N  # Time step
+        step = sigma * np.sqrt(dt)  # log of the up factor
+        u = np.exp(step)  # Up factor
+        d = 1 / u  # Down factor
+        p = (np.exp((r - q) * dt) - d) / (u - d)  # Risk-neutral probability, net of the dividend yield
+        # When sigma * sqrt(dt) < |r - q| * dt, p leaves [0, 1] and the tree has no valid price; NaN propagates
+        p = np.where((p >= 0) & (p <= 1), p, np.nan)
+        discount = np.exp(-r * dt)
+        p_up = discount * p
+        p_down = discount * (1 - p)
+
+        # Every node of the tree lies on one of 2N + 1 price levels S * u^k, k = N..-N;
+        # node j at step i sits on level k = i - 2j, i.e. rows N - i .. N + i in steps of 2
+        stock_levels = S * np.exp(np.arange(N, -N - 1, -1)[:, None] * step)
+        option_values = np.maximum(sign * (stock_levels[::2] - K), 0)
+
+        # Early-exercise boundary: the critical stock price at each step (NaN where no node is exercised)
+        boundary = np.full((N + 1, S.size), np.nan)
+        if american:
+            boundary[N] = K
+        early_values = [None] * keep_steps
+
+        last_step = N
+        if smooth:
+            from .bsm import black_scholes  # imported here so the lattices alone do not load SciPy
+
+            last_step = N - 1
+            stock_prices = stock_levels[1:2 * N:2]
+            option_values[:N] = black_scholes(stock_prices, K, dt, r, sigma, sign > 0, q)
+            if american:
+                np.maximum(option_values[:N], sign * (stock_prices - K), out=option_values[:N])
+
+    with stage("binomial/rollback"):
+        # Roll back a single value vector: node j at step i sees nodes j and j + 1 at step i + 1
+        for i in range(last_step, 0, -1):
+            option_values[:i] = p_up * option_values[:i] + p_down * option_values[1:i + 1]
+            if american:
+                stock_prices = stock_levels[N - i + 1:N + i:2]
+                exercise_values = sign * (stock_prices - K)
+                if return_boundary:
+                    exercised = (exercise_values > 0) & (exercise_values >= option_values[:i])
+                    # Highest exercised price for puts, lowest for calls
+                    edge = -sign * np.max(np.where(exercised, -sign * stock_prices, -np.inf), axis=0)
+                    boundary[i - 1] = np.where(np.isfinite(edge), edge, np.nan)
+                np.maximum(option_values[:i], exercise_values, out=option_values[:i])
+            if 1 <= i - 1 <= keep_steps:
+                early_values[i - 2] = option_values[:i].copy()
+    count("lattice_nodes", (N + 1) * (N + 2) // 2 * S.size)
+
+    return option_values[0], boundary, early_values
+
+
+def _ladder(S, K, T, r, sigma, q, N, american):
+    """Call and put values for every strike in ``K``, from one tree per volatility in ``sigma``.
+
+    Returns the call and put values, each shaped (len(K), len(sigma)).
+    """
+    with stage("binomial/build"):
+        dt = T / N
+        step = sigma * np.sqrt(dt)
+        u = np.exp(step)
+        d = 1 / u
+        p = (np.exp((r - q) * dt) - d) / (u - d)
+        p = np.where((p >= 0) & (p <= 1), p, np.nan)
+        discount = np.exp(-r * dt)
+        p_up = discount * p
+        p_down = discount * (1 - p)
+        stock_levels = S * np.exp(np.arange(N, -N - 1, -1)[:, None] * step)
+
+    with stage("binomial/rollback"):
+        if not american:
+            # Discounted probabilities of the terminal nodes, rolled forward once per tree;
+            # each European value is then one weighted sum of its payoffs
+            weights = np.zeros((N + 1, sigma.size))
+            weights[0] = 1
+            for i in range(N):
+                previous = weights[:i + 1].copy()
+                weights[:i + 1] = p_up * previous
+                weights[1:i + 2] += p_down * previous
+            terminal = stock_levels[::2]
+            calls = np.einsum("jv,jvk->kv", weights, np.maximum(terminal[:, :, None] - K, 0))
+            # Put-call parity holds exactly on the tree
+            puts = calls - (weights * terminal).sum(axis=0) + K[:, None] * weights.sum(axis=0)
+            count("lattice_nodes", (N + 1) * (N + 2) // 2 * sigma.size)
+            return calls, puts
+
+        # American values: every strike and both option types rolled back together on the shared tree
+        sign = np.repeat([1.0, -1.0], K.size)
+        strikes = np.tile(K, 2)
+        option_values = np.maximum(sign * (stock_levels[::2, :, None] - strikes), 0)
+        p_up, p_down = p_up[:, None], p_down[:, None]
+        for i in range(N, 0, -1):
+            option_values[:i] = p_up * option_values[:i] + p_down * option_values[1:i + 1]
+            exercise_values = sign * (stock_levels[N - i + 1:N + i:2, :, None] - strikes)
+            np.maximum(option_values[:i], exercise_values, out=option_values[:i])
+    count("lattice_nodes", (N + 1) * (N + 2) // 2 * sigma.size * sign.size)
+
+    calls, puts = option_values[0].reshape(sigma.size, 2, K.size).transpose(1, 2, 0)
+    return calls, puts
+
+
+def binomial_model(S, K, T, r, sigma, N, option_type="call", q=0.0, exercise="european", return_boundary=False):
+    """Cox-Ross-Rubinstein binomial price of European or American options.
+
+    Inputs broadcast onto a batch that is rolled back together, using O(N x batch)
+    memory. ``q`` is a continuous dividend yield. With ``return_boundary=True`` the
+    early-exercise boundary (critical stock price per step, shape (N+1,) + batch
+    shape) is returned alongside the price. Contracts whose step is too coarse
+    for valid branch probabilities (sigma too small next to r - q) are NaN.
+    """
+    # Parameters broadcast to a batch; the lattice keeps nodes on axis 0 and the batch on axis 1
+    shape, S, K, T, r, sigma, q, sign = flatten_batch(S, K, T, r, sigma, q, option_sign(option_type))
+    american = check_exercise(exercise)
+
+    price, boundary, _ = _rollback(S, K, T, r, sigma, q, sign, N, american, return_boundary)
+
+    price = restore_batch(price, shape)
+    if return_boundary:
+        return price, boundary.reshape((N + 1,) + shape)
+    return price
+
+
+def binomial_greeks(S, K, T, r, sigma, N, option_type="call", q=0.0, exercise="european"):
+    """Price, delta, gamma, vega, theta and rho from the binomial tree.
+
+    Delta, gamma and theta are read off the nodes at steps 1 and 2 of the
+    rollback that prices the option. Vega and rho use central bumps (a forward
+    bump for vega at very low volatility) that are stacked onto the batch axis,
+    so everything comes from one rollback. ``N`` is raised to
+    ``GREEKS_MIN_STEPS`` if smaller.
+    Returns a dict of arrays (floats for scalar inputs); theta is per year.
+    """
+    shape, S, K, T, r, sigma, q, sign = flatten_batch(S, K, T, r, sigma, q, option_sign(option_type))
+    american = check_exercise(exercise)
+    N = max(N, GREEKS_MIN_STEPS)
+
+    root, _, (step_1, step_2) = _rollback(*bump_batch(S, K, T, r, sigma, q, sign), N, american, keep_steps=2)
+
+    size = S.size
+    price, sigma_up, sigma_down, rate_up, rate_down = root.reshape(5, size)
+    f_u, f_d = step_1[:, :size]
+    f_uu, f_ud, f_dd = step_2[:, :size]
+
+    dt = T / N
+    h = sigma * np.sqrt(dt)
+    S_u, S_d = S * np.exp(h), S * np.exp(-h)
+    S_uu, S_dd = S * np.exp(2 * h), S * np.exp(-2 * h)
+
+    greeks = {
+        "price": price,
+        "delta": (f_u - f_d) / (S_u - S_d),
+        "gamma": ((f_uu - f_ud) / (S_uu - S) - (f_ud - f_dd) / (S - S_dd)) / ((S_uu - S_dd) / 2),
+        "vega": (sigma_up - sigma_down) / np.subtract(*sigma_bumps(sigma)),
+        "theta": (f_ud - price) / (2 * dt),
+        "rho": (rate_up - rate_down) / (2 * RATE_BUMP),
+    }
+    return {name: restore_batch(values, shape) for name, values in greeks.items()}
+
+
+def binomial_ladder(S, K, T, r, sigma, N, q=0.0, exercise="european"):
+    """Call and put prices for a ladder of strikes from a single binomial tree.
+
+    The tree depends on S, T, r, sigma and q but not on the strike or payoff,
+    so every strike in ``K`` and both option types share one build: European
+    prices weight the terminal payoffs by node probabilities rolled forward
+    once, American ones roll all payoffs back together. ``sigma`` may also be
+    1-D (one tree per volatility). Returns a dict with ``call`` and ``put``
+    shaped (len(K),), (len(K), len(sigma)) or scalar.
+    """
+    american = check_exercise(exercise)
+    strikes = np.atleast_1d(np.asarray(K, dtype=float))
+    sigmas = np.atleast_1d(np.asarray(sigma, dtype=float))
+
+    calls, puts = _ladder(float(S), strikes, float(T), float(r), sigmas, float(q), N, american)
+
+    shape = np.shape(K) + np.shape(sigma)
+    return {"call": restore_batch(calls, shape), "put": restore_batch(puts, shape)}
@@ -0,0 +1,63 @@
+"""Closed-form Black-Scholes pricing for European options."""
+
+import numpy as np
+from scipy.special import ndtr
+
+from ._batch import option_sign
+from .instrument import stage
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+def black_scholes(S, K, T, r, sigma, option_type="call", q=0.0):
+    """Black-Scholes price of European calls and puts.
+
+    All inputs broadcast against each other, so a whole chain prices in one
+    vectorized pass. ``option_type`` is "call"/"put" (or "c"/"p", in any case)
+    or boolean call flags and ``q`` is a continuous dividend yield. Scalar
+    inputs return a float.
+    """
+    S, K, T, r, sigma, q = (np.asarray(x, dtype=float) for x in (S, K, T, r, sigma, q))
+    sign = option_sign(option_type)  # +1 for calls, -1 for puts
+
+    with stage("black_scholes"):
+        vol = sigma * np.sqrt(T)
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma**2) * T) / vol
+        d2 = d1 - vol
+
+        price = sign * (S * np.exp(-q * T) * ndtr(sign * d1) - K * np.exp(-r * T) * ndtr(sign * d2))
+    return price if price.ndim else float(price)
+
+
+def black_scholes_greeks(S, K, T, r, sigma, option_type="call", q=0.0):
+    """Closed-form price, delta, gamma, vega, theta and rho.
+
+    Broadcasts like ``black_scholes`` and returns a dict of arrays (floats for
+    scalar inputs). Vega and rho are per unit of sigma and r, theta is per year.
+    """
+    S, K, T, r, sigma, q = (np.asarray(x, dtype=float) for x in (S, K, T, r, sigma, q))
+    sign = option_sign(option_type)
+
+    with stage("black_scholes_greeks"):
+        sqrt_T = np.sqrt(T)
+        vol = sigma * sqrt_T
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma**2) * T) / vol
+        d2 = d1 - vol
+        dividend_discount = np.exp(-q * T)
+        discounted_K = K * np.exp(-r * T)
+        density = np.exp(-0.5 * d1**2) / _SQRT_2PI
+        N_d1, N_d2 = ndtr(sign * d1), ndtr(sign * d2)
+
+        greeks = {
+            "price": sign * (S * dividend_discount * N_d1 - discounted_K * N_d2),
+            "delta": sign * dividend_discount * N_d1,
+            "gamma": dividend_discount * density / (S * vol),
+            "vega": S * dividend_discount * density * sqrt_T,
+            "theta": (
+                -S * dividend_discount * density * sigma / (2 * sqrt_T)
+                - sign * r * discounted_K * N_d2
+                + sign * q * S * dividend_discount * N_d1
+            ),
+            "rho": sign * discounted_K * T * N_d2,
+        }
+    return {name: values if values.ndim else float(values) for name, values in greeks.items()}
@@ -0,0 +1,143 @@
+"""Bounded, thread-safe memoization of pricing results.
+
+A single process-wide ``default_cache`` is shared by every Streamlit session
+(the ``pricing`` package is only imported once per server process). Entries are
+keyed on the pricing function and its normalized inputs, evicted least recently
+used once ``maxsize`` is reached, and expire after ``ttl`` seconds.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from .instrument import count
+
+
+def _normalize(value):
+    # Round floats so inputs that differ only by float noise (e.g. 0.1 * 3 vs 0.3) share a key
+    if isinstance(value, (float, np.floating)):
+        return float(f"{float(value):.12g}")
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def make_key(func, **params):
+    """Hashable cache key for ``func`` called with the keyword arguments ``params``."""
+    return (func.__module__, func.__qualname__) + tuple(
+        (name, _normalize(value)) for name, value in sorted(params.items())
+    )
+
+
+class PriceCache:
+    """LRU cache with a size bound, a time-to-live and hit/miss statistics."""
+
+    def __init__(self, maxsize=100_000, ttl=3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expiry time, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                    self.evictions += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+default_cache = PriceCache()
+
+_MISSING = object()
+
+
+def cached_call(func, cache=None, **params):
+    """Call ``func(**params)`` through the cache; the result is shared, so treat arrays as read-only."""
+    cache = default_cache if cache is None else cache
+    key = make_key(func, **params)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        count("cache_misses")
+        value = func(**params)
+        cache.set(key, value)
+    else:
+        count("cache_hits")
+    return value
+
+
+def cached_grid(func, S_range, sigma_range, cache=None, field=None, **params):
+    """Price ``func`` over the S x sigma grid, reusing cells cached by earlier grids.
+
+    Each cell is cached on its own, so a grid overlapping an earlier one (same
+    contract, some shared S/sigma points) only prices the new cells, in a single
+    batched call. If ``func`` returns a dict of arrays (the Greeks engines), every
+    entry is cached per cell and ``field`` selects the one returned. Returns a
+    (len(S_range), len(sigma_range)) array.
+    """
+    cache = default_cache if cache is None else cache
+    S_grid, sigma_grid = np.meshgrid(np.asarray(S_range, dtype=float), np.asarray(sigma_range, dtype=float), indexing="ij")
+    grid = np.empty(S_grid.shape)
+
+    keys = [make_key(func, S=S_val, sigma=sigma_val, **params) for S_val, sigma_val in zip(S_grid.flat, sigma_grid.flat)]
+    missing = []
+    for index, key in enumerate(keys):
+        value = cache.get(key)
+        if value is None:
+            missing.append(index)
+        else:
+            grid.flat[index] = value if field is None else value[field]
+
+    count("cache_hits", len(keys) - len(missing))
+    count("cache_misses", len(missing))
+    if missing:
+        missing = np.array(missing)
+        result = func(S=S_grid.flat[missing], sigma=sigma_grid.flat[missing], **params)
+        if field is None:
+            result = np.asarray(result)
+            grid.flat[missing] = result
+            cells = (float(value) for value in result)
+        else:
+            grid.flat[missing] = result[field]
+            cells = ({name: float(values[n]) for name, values in result.items()} for n in range(len(missing)))
+        for index, cell in zip(missing, cells):
+            cache.set(keys[index], cell)
+    return grid
@@ -0,0 +1,105 @@
+"""Vectorized Black-Scholes implied volatility."""
+
+import numpy as np
+from scipy.special import ndtr
+
+from ._batch import flatten_batch, option_sign, restore_batch
+
+# Status codes returned alongside the volatilities with ``return_status=True``
+IV_OK = 0
+IV_BELOW_INTRINSIC = 1  # price under the discounted intrinsic value (arbitrage)
+IV_ABOVE_MAXIMUM = 2  # price at or above the no-arbitrage upper bound
+IV_NO_TIME_VALUE = 3  # price equals intrinsic; volatility cannot be resolved
+IV_NOT_CONVERGED = 4
+IV_INVALID_INPUT = 5  # non-finite input, or S, K or T not positive
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+def _otm_log_price(forward, K, theta, v):
+    """Log of the undiscounted out-of-the-money Black price and its first two derivatives in total vol v."""
+    d1 = np.log(forward / K) / v + v / 2
+    d2 = d1 - v
+    price = theta * (forward * ndtr(theta * d1) - K * ndtr(theta * d2))
+    vega = forward * np.exp(-d1**2 / 2) / _SQRT_2PI
+    volga = vega * d1 * d2 / v
+    slope = vega / price
+    return np.log(price), slope, volga / price - slope**2
+
+
+def implied_volatility(price, S, K, T, r, option_type="call", q=0.0, tol=1e-10, max_iter=60, return_status=False):
+    """Black-Scholes implied volatility for whole arrays of quotes.
+
+    Each quote is reduced to the time value of its out-of-the-money counterpart,
+    started from the Corrado-Miller rational approximation and refined with
+    Halley steps on the log price, falling back to bisection whenever a step
+    leaves the bracket. Quotes that violate no-arbitrage bounds, carry no time
+    value or have invalid inputs (non-finite values, or S, K or T not positive)
+    are returned as NaN rather than raising; with ``return_status=True`` an
+    array of ``IV_*`` status codes explains why.
+    """
+    shape, price, S, K, T, r, q, sign = flatten_batch(price, S, K, T, r, q, option_sign(option_type))
+    finite = np.isfinite(price) & np.isfinite(S) & np.isfinite(K) & np.isfinite(T) & np.isfinite(r) & np.isfinite(q)
+    invalid = ~(finite & (S > 0) & (K > 0) & (T > 0))
+
+    # Invalid quotes are flagged here and never reach the solve, but the setup still sees them
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        discount = np.exp(-r * T)
+        forward = S * np.exp((r - q) * T)
+        undiscounted = price / discount
+        intrinsic = np.maximum(sign * (forward - K), 0)
+        upper = np.where(sign > 0, forward, K)
+        time_value = undiscounted - intrinsic
+
+        status = np.full(price.shape, IV_NOT_CONVERGED)
+        status[undiscounted >= upper] = IV_ABOVE_MAXIMUM
+        status[time_value < -tol * K] = IV_BELOW_INTRINSIC
+        status[(status == IV_NOT_CONVERGED) & (time_value <= tol * K)] = IV_NO_TIME_VALUE
+        status[invalid] = IV_INVALID_INPUT
+        vols = np.full(price.shape, np.nan)
+
+        # Out-of-the-money side: call when K >= F, put otherwise; its price is the time value
+        theta = np.where(K >= forward, 1.0, -1.0)
+
+        # Corrado-Miller initial guess for the total volatility sigma * sqrt(T)
+        call_price = time_value + np.maximum(forward - K, 0)
+        half_gap = (forward - K) / 2
+        inner = np.maximum((call_price - half_gap) ** 2 - (forward - K) ** 2 / np.pi, 0)
+        guess = _SQRT_2PI / (forward + K) * (call_price - half_gap + np.sqrt(inner))
+        guess = np.where(np.isfinite(guess) & (guess > 1e-4), guess, 0.2 * np.sqrt(np.abs(T)) + 1e-4)
+
+    active = np.flatnonzero(status == IV_NOT_CONVERGED)
+    v = guess[active]
+    lo = np.zeros_like(v)
+    hi = np.full_like(v, np.inf)
+    f, k, th = forward[active], K[active], theta[active]
+    target = np.log(time_value[active])
+
+    for _ in range(max_iter):
+        if not active.size:
+            break
+        log_price, slope, curvature = _otm_log_price(f, k, th, v)
+        diff = log_price - target
+        # Price increases with volatility, so the sign of diff tightens the bracket
+        hi = np.where(diff > 0, v, hi)
+        lo = np.where(diff <= 0, v, lo)
+
+        step = diff / slope / (1 - diff * curvature / (2 * slope**2))  # Halley
+        candidate = v - step
+        outside = ~np.isfinite(candidate) | (candidate <= lo) | (candidate >= hi)
+        fallback = np.where(np.isfinite(hi), (lo + hi) / 2, 2 * v)
+        candidate = np.where(outside, fallback, candidate)
+
+        solved = np.abs(diff) < tol
+        done = solved | (np.abs(candidate - v) < tol * v)
+        vols[active[done]] = np.where(solved, v, candidate)[done] / np.sqrt(T[active[done]])
+        status[active[done]] = IV_OK
+
+        keep = ~done
+        active, v, lo, hi = active[keep], candidate[keep], lo[keep], hi[keep]
+        f, k, th, target = f[keep], k[keep], th[keep], target[keep]
+
+    vols = restore_batch(vols, shape)
+    if return_status:
+        return vols, restore_batch(status, shape)
+    return vols
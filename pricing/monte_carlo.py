@@ -0,0 +1,157 @@
+"""Monte Carlo pricing of European and path-dependent options under GBM.
+
+Paths are generated in fixed-size chunks so memory stays bounded by
+``chunk_size * steps`` however many paths are requested. Each chunk draws from
+its own child of one ``SeedSequence``, so results are reproducible and do not
+depend on how many worker processes the chunks are spread over. Chunks only
+return running sums, which are merged to form the estimate and its standard
+error; simulation stops early once the error tolerance is met.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ._batch import option_sign
+from .bsm import black_scholes
+from .instrument import count, stage
+
+PAYOFFS = ("european", "asian", "barrier", "lookback")
+BARRIER_TYPES = ("up-and-out", "down-and-out", "up-and-in", "down-and-in")
+
+
+def gbm_paths(S, T, r, sigma, normals, q=0.0):
+    """GBM price paths from standard normals of shape (paths, steps), including S at t=0."""
+    steps = normals.shape[1]
+    dt = T / steps
+    increments = (r - q - 0.5 * sigma**2) * dt + sigma * math.sqrt(dt) * normals
+    log_paths = np.concatenate([np.zeros((len(normals), 1)), np.cumsum(increments, axis=1)], axis=1)
+    return S * np.exp(log_paths)
+
+
+def _payoff(paths, K, sign, payoff, barrier, barrier_type):
+    final = paths[:, -1]
+    if payoff == "european":
+        return np.maximum(sign * (final - K), 0)
+    if payoff == "asian":
+        # Arithmetic average over the monitoring dates, excluding t=0
+        return np.maximum(sign * (paths[:, 1:].mean(axis=1) - K), 0)
+    if payoff == "lookback":
+        # Floating strike: calls pay S_T - min S, puts pay max S - S_T
+        extreme = paths.min(axis=1) if sign > 0 else paths.max(axis=1)
+        return sign * (final - extreme)
+    # Discretely monitored knock-out / knock-in barrier on a vanilla payoff
+    hit = paths.max(axis=1) >= barrier if barrier_type.startswith("up") else paths.min(axis=1) <= barrier
+    alive = ~hit if barrier_type.endswith("out") else hit
+    return np.where(alive, np.maximum(sign * (final - K), 0), 0.0)
+
+
+def _simulate_chunk(seed, n_paths, S, K, T, r, sigma, q, sign, payoff, barrier, barrier_type, steps, antithetic):
+    """Simulate one chunk and return its sums (n, y, y^2, x, x^2, xy).
+
+    ``y`` is the discounted payoff and ``x`` the control variate: the discounted
+    European payoff, or the discounted S_T when the payoff itself is European.
+    With antithetic sampling each sample is the mean over a path and its mirror.
+    """
+    rng = np.random.default_rng(seed)
+    normals = rng.standard_normal((n_paths // 2 if antithetic else n_paths, steps))
+    discount = math.exp(-r * T)
+
+    def discounted(normals):
+        paths = gbm_paths(S, T, r, sigma, normals, q)
+        y = discount * _payoff(paths, K, sign, payoff, barrier, barrier_type)
+        x = discount * (paths[:, -1] if payoff == "european" else np.maximum(sign * (paths[:, -1] - K), 0))
+        return y, x
+
+    y, x = discounted(normals)
+    if antithetic:
+        y_mirror, x_mirror = discounted(-normals)
+        y, x = (y + y_mirror) / 2, (x + x_mirror) / 2
+    return np.array([len(y), y.sum(), (y * y).sum(), x.sum(), (x * x).sum(), (x * y).sum()])
+
+
+def _estimate(totals, control_mean):
+    """Price and standard error from merged chunk sums, optionally with a control variate."""
+    n, sum_y, sum_yy, sum_x, sum_xx, sum_xy = totals
+    mean_y = sum_y / n
+    var_y = max(sum_yy / n - mean_y**2, 0.0) * n / max(n - 1, 1)
+    if control_mean is None:
+        return mean_y, math.sqrt(var_y / n)
+    mean_x = sum_x / n
+    var_x = max(sum_xx / n - mean_x**2, 0.0) * n / max(n - 1, 1)
+    cov_xy = (sum_xy / n - mean_x * mean_y) * n / max(n - 1, 1)
+    beta = cov_xy / var_x if var_x > 0 else 0.0
+    price = mean_y - beta * (mean_x - control_mean)
+    return price, math.sqrt(max(var_y - beta * cov_xy, 0.0) / n)
+
+
+def monte_carlo(S, K, T, r, sigma, option_type="call", q=0.0, payoff="european", barrier=None,
+                barrier_type="up-and-out", steps=252, paths=100_000, chunk_size=20_000,
+                antithetic=True, control_variate=True, tol=None, seed=0, workers=1):
+    """Monte Carlo price of one option with its standard error.
+
+    ``payoff`` is "european", "asian" (arithmetic average), "barrier" (needs
+    ``barrier`` and ``barrier_type``) or "lookback" (floating strike, ``K`` unused).
+    With ``control_variate`` the discounted European payoff is used as a control,
+    with ``black_scholes`` as its known mean; European payoffs use the discounted
+    S_T instead, with mean S e^(-qT). Up to ``paths`` paths are simulated in chunks
+    of ``chunk_size`` on ``workers`` processes; with ``tol`` set, simulation stops
+    after the first chunk (in seed order) at which the standard error is at or
+    below it.
+
+    Returns a dict with ``price``, ``std_error`` and ``paths`` (the number used).
+    """
+    if payoff not in PAYOFFS:
+        raise ValueError(f"payoff must be one of {PAYOFFS}, got {payoff!r}")
+    if payoff == "barrier":
+        if barrier is None:
+            raise ValueError("barrier payoffs need a barrier level")
+        if barrier_type not in BARRIER_TYPES:
+            raise ValueError(f"barrier_type must be one of {BARRIER_TYPES}, got {barrier_type!r}")
+    sign = float(option_sign(option_type))
+    steps = 1 if payoff == "european" else steps
+    chunk_size = max(2, min(chunk_size, paths))
+    chunk_size += chunk_size % 2 if antithetic else 0
+
+    n_chunks = math.ceil(paths / chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    # The last chunk only makes up the remainder (rounded up to a whole antithetic pair)
+    last_chunk = paths - (n_chunks - 1) * chunk_size
+    sizes = [chunk_size] * (n_chunks - 1) + [last_chunk + last_chunk % 2 if antithetic else last_chunk]
+    control_mean = None
+    if control_variate:
+        control_mean = S * math.exp(-q * T) if payoff == "european" else black_scholes(S, K, T, r, sigma, option_type, q)
+    chunk_args = (S, K, T, r, sigma, q, sign, payoff, barrier, barrier_type, steps, antithetic)
+
+    totals = np.zeros(6)
+    price, std_error = math.nan, math.inf
+    with stage("monte_carlo/simulate"):
+        pool = ProcessPoolExecutor(workers) if workers > 1 and n_chunks > 1 else None
+
+        def chunk_results():
+            # Chunks run in rounds of one per worker and come back in seed order
+            for start in range(0, n_chunks, max(workers, 1)):
+                round_seeds = seeds[start:start + max(workers, 1)]
+                round_sizes = sizes[start:start + max(workers, 1)]
+                if pool:
+                    yield from pool.map(_simulate_chunk, round_seeds, round_sizes,
+                                        *([arg] * len(round_seeds) for arg in chunk_args))
+                else:
+                    yield from (_simulate_chunk(s, n, *chunk_args) for s, n in zip(round_seeds, round_sizes))
+
+        try:
+            # The tolerance is checked after every chunk, so where simulation stops (and the result)
+            # does not depend on the worker count; the rest of a round is discarded
+            for result in chunk_results():
+                totals += result
+                price, std_error = _estimate(totals, control_mean)
+                if tol is not None and std_error <= tol:
+                    break
+        finally:
+            if pool:
+                pool.shutdown()
+
+    used = int(totals[0] * (2 if antithetic else 1))
+    count("monte_carlo_paths", used)
+    return {"price": float(price), "std_error": float(std_error), "paths": used}
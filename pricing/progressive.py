@@ -0,0 +1,136 @@
+"""Background, coarse-to-fine filling of pricing grids.
+
+A ``ProgressiveGrid`` prices a rows x cols grid on a worker thread so the
+caller (a Streamlit page) stays responsive. It starts from a coarse sub-grid
+and refines it, chunk by chunk, and every chunk lands in ``grid`` as soon as it
+is priced, so a partial result can be shown at any time (unpriced cells are
+NaN). ``cancel()`` stops the job at the next chunk boundary, which is how stale
+work is dropped when the inputs change.
+
+Context variables do not follow work onto the worker thread, so a job started
+while a ``Recorder`` is active records into its own recorder instead (every
+chunk under ``heatmap/compute``); ``report()`` adds that to the caller's
+recorder once the job is done.
+
+    job = ProgressiveGrid(lambda rows, cols: price(S_range[rows, None], sigma_range[cols]), (200, 50)).start()
+    grid, done = job.snapshot()
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+
+from .instrument import Recorder, active_recorder, stage
+
+# Shared by every job in the process, so abandoned or queued jobs cannot pile up threads
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="progressive-grid")
+
+
+class ProgressiveGrid:
+    """Fill a grid in a background thread, coarse to fine, with cancellation.
+
+    ``compute(row_index, col_index)`` returns the (len(row_index), len(col_index))
+    sub-grid for the given row and column indices. With ``by_column=True`` (for
+    engines such as the PDE solver or the strike ladder, which price a whole
+    column at once) refinement only thins out the columns and every call gets
+    all rows; otherwise both axes are refined, and each pass recomputes the
+    cells of coarser passes, which ``compute`` is expected to serve from a
+    cache. Passes use every ``stride``-th row/column for each of ``strides``,
+    and each pass is split into chunks of about ``chunk_cells`` cells.
+    """
+
+    def __init__(self, compute, shape, by_column=False, strides=(8, 4, 2, 1), chunk_cells=256):
+        self.compute = compute
+        self.shape = shape
+        self.by_column = by_column
+        self.strides = strides
+        self.chunk_cells = chunk_cells
+        self.grid = np.full(shape, np.nan)
+        self.error = None
+        self.elapsed = 0.0
+        self._filled = np.zeros(shape, dtype=bool)
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._recorder = None
+
+    def start(self):
+        # Allocation tracking is process-wide, so the job only records timings and counters
+        self._recorder = Recorder() if active_recorder() is not None else None
+        # A fresh context, so the job's recorder never leaks into other work on the pool thread
+        _executor.submit(contextvars.Context().run, self._run)
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def done(self):
+        """True once the worker has stopped: finished, failed (see ``error``) or cancelled."""
+        return self._done.is_set()
+
+    @property
+    def progress(self):
+        """Fraction of the cells priced so far."""
+        return float(self._filled.mean())
+
+    def snapshot(self):
+        """A copy of the grid so far (NaN where not yet priced) and whether the worker has stopped."""
+        with self._lock:
+            return self.grid.copy(), self.done
+
+    def wait(self, timeout=None):
+        """Block until the worker stops; False if ``timeout`` ran out first."""
+        return self._done.wait(timeout)
+
+    def report(self):
+        """Once the job is done, add its timings and counters to the active recorder (only the first time)."""
+        recorder = active_recorder()
+        if self.done and self._recorder is not None and recorder is not None:
+            recorder.merge(self._recorder)
+            self._recorder = None
+
+    def _chunks(self):
+        rows, cols = self.shape
+        all_rows = np.arange(rows)
+        for stride in self.strides:
+            if self.by_column:
+                # New columns only, all rows each
+                col_index = np.array([j for j in range(0, cols, stride) if not self._filled[0, j]], dtype=int)
+                block = max(self.chunk_cells // rows, 1)
+                for start in range(0, col_index.size, block):
+                    yield all_rows, col_index[start:start + block]
+            else:
+                row_index, col_index = np.arange(0, rows, stride), np.arange(0, cols, stride)
+                if self._filled[np.ix_(row_index, col_index)].all():
+                    continue
+                block = max(self.chunk_cells // col_index.size, 1)
+                for start in range(0, row_index.size, block):
+                    yield row_index[start:start + block], col_index
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            with self._recorder or nullcontext():
+                for row_index, col_index in self._chunks():
+                    if self._cancelled.is_set():
+                        return
+                    with stage("heatmap/compute"):
+                        values = np.asarray(self.compute(row_index, col_index), dtype=float)
+                    cells = np.ix_(row_index, col_index)
+                    with self._lock:
+                        self.grid[cells] = values
+                        self._filled[cells] = True
+        except Exception as error:  # surfaced to the caller through .error
+            self.error = error
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self._done.set()
@@ -0,0 +1,189 @@
+"""Portfolio P&L over a grid of joint market shocks.
+
+Every (position, scenario) pair is one contract to price, which quickly runs
+to millions of evaluations. The pairs are flattened scenario-major and priced
+in tiles small enough that each worker stays under its share of a memory
+budget; every tile reduces straight to per-scenario P&L, so nothing of size
+positions x scenarios is ever held. Tiles run on a process pool with a bounded
+number in flight.
+"""
+
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ._batch import check_exercise, option_sign
+from .binomial import binomial_model
+from .bsm import black_scholes
+from .instrument import count, stage
+from .trinomial import trinomial_model
+
+MODELS = ("black-scholes", "binomial", "trinomial")
+# Shock axes in the order they appear in the P&L array
+SHOCK_AXES = ("spot", "vol", "rate", "days")
+# Vol shocks are floored here
+MIN_SIGMA = 0.01
+# Lattice volatilities are also kept this far above the level where the branch
+# probabilities leave [0, 1] (sigma * sqrt(dt) = |r - q| * dt), where the trees return NaN
+LATTICE_SIGMA_MARGIN = 1.001
+
+# Portfolio and shocks, sent once to each worker process by the pool initializer
+_worker_state = {}
+
+
+def bytes_per_contract(model, N):
+    """Rough peak bytes per contract in a tile: the pricing engine's working set plus tile bookkeeping."""
+    bookkeeping = 20 * 8  # gathered inputs, indices and P&L weights
+    if model == "black-scholes":
+        return bookkeeping + 16 * 8
+    # Price levels (2N + 1), the value vector and the rollback/exercise temporaries (measured)
+    levels = 2 * N + 1
+    if model == "binomial":
+        return bookkeeping + 8 * (levels + 6 * (N + 1))
+    return bookkeeping + 8 * 6 * levels
+
+
+def _value(model, N, exercise, S, K, T, r, sigma, q, sign):
+    """Model values of a flat batch; contracts at or past expiry are worth their intrinsic value.
+
+    On the lattices, volatilities too low for valid branch probabilities at
+    ``N`` steps (a large rate shock on a low-vol, long-dated position) are
+    raised to the lowest valid level rather than priced as NaN.
+    """
+    values = np.maximum(sign * (S - K), 0)
+    live = T > 0
+    if live.any():
+        S, K, T, r, sigma, q, call = (x[live] for x in (S, K, T, r, sigma, q, sign > 0))
+        if model == "black-scholes":
+            values[live] = black_scholes(S, K, T, r, sigma, call, q)
+        else:
+            engine = binomial_model if model == "binomial" else trinomial_model
+            sigma = np.maximum(sigma, LATTICE_SIGMA_MARGIN * np.abs(r - q) * np.sqrt(T / N))
+            values[live] = engine(S, K, T, r, sigma, N, call, q, exercise)
+    return values
+
+
+def _shocked_inputs(portfolio, shocks, positions, scenarios):
+    """Inputs of the (position, scenario) pairs after applying each scenario's shocks."""
+    spot, vol, rate, days = (shocks[name][scenarios] for name in SHOCK_AXES)
+    return (
+        portfolio["S"][positions] * (1 + spot),
+        portfolio["K"][positions],
+        np.maximum(portfolio["T"][positions] - days / 365.0, 0.0),
+        portfolio["r"][positions] + rate,
+        np.maximum(portfolio["sigma"][positions] + vol, MIN_SIGMA),
+        portfolio["q"][positions],
+        portfolio["sign"][positions],
+    )
+
+
+def _init_worker(portfolio, shocks, model, N, exercise):
+    _worker_state.update(portfolio=portfolio, shocks=shocks, model=model, N=N, exercise=exercise)
+
+
+def _evaluate_tile(start, stop):
+    """P&L of the flat (scenario-major) pairs start..stop, summed per scenario.
+
+    Returns the first scenario index and the P&L of the scenarios the tile touches.
+    """
+    state = _worker_state
+    portfolio = state["portfolio"]
+    n_positions = len(portfolio["S"])
+    pairs = np.arange(start, stop)
+    positions, scenarios = pairs % n_positions, pairs // n_positions
+    values = _value(state["model"], state["N"], state["exercise"],
+                    *_shocked_inputs(portfolio, state["shocks"], positions, scenarios))
+    pnl = portfolio["quantity"][positions] * (values - portfolio["base_value"][positions])
+    first = scenarios[0]
+    return first, np.bincount(scenarios - first, weights=pnl)
+
+
+def shock_grid(spot=(0.0,), vol=(0.0,), rate=(0.0,), days=(0.0,)):
+    """Every combination of the shock axes, as flat per-scenario arrays plus the axis values.
+
+    ``spot`` is a relative move in S, ``vol`` and ``rate`` are absolute moves in
+    sigma and r, and ``days`` is calendar time elapsed (theta decay).
+    """
+    axes = {name: np.atleast_1d(np.asarray(values, dtype=float))
+            for name, values in zip(SHOCK_AXES, (spot, vol, rate, days))}
+    combos = np.array(list(itertools.product(*axes.values())), dtype=float).reshape(-1, len(SHOCK_AXES))
+    return {name: np.ascontiguousarray(combos[:, i]) for i, name in enumerate(SHOCK_AXES)}, axes
+
+
+def scenario_pnl(portfolio, spot=(0.0,), vol=(0.0,), rate=(0.0,), days=(0.0,), model="black-scholes", N=100,
+                 exercise="european", memory_budget=256 * 2**20, workers=1):
+    """Portfolio P&L for every combination of spot, vol, rate and time shocks.
+
+    ``portfolio`` maps column names to equal-length arrays: S, K, T, r, sigma,
+    and optionally option_type ("call"/"put" or "c"/"p", or call flags), q and
+    quantity (default 1). Every position is priced with ``model`` (``N`` steps and
+    ``exercise`` for the lattices). Work is tiled so each of the ``workers``
+    processes prices at most ``memory_budget / workers`` bytes' worth of
+    contracts at a time.
+
+    Returns a dict with ``pnl`` shaped (len(spot), len(vol), len(rate), len(days)),
+    the shock ``axes``, the unshocked ``base_value`` of the portfolio, and the
+    ``evaluations``, ``tiles`` and ``tile_size`` used.
+    """
+    if model not in MODELS:
+        raise ValueError(f"model must be one of {MODELS}, got {model!r}")
+    if check_exercise(exercise) and model == "black-scholes":
+        raise ValueError("Black-Scholes only prices European options")
+
+    size = len(np.atleast_1d(portfolio["S"]))
+    columns = {name: np.asarray(portfolio[name], dtype=float) for name in ("S", "K", "T", "r", "sigma")}
+    columns["q"] = np.asarray(portfolio.get("q", 0.0), dtype=float)
+    columns["quantity"] = np.asarray(portfolio.get("quantity", 1.0), dtype=float)
+    columns["sign"] = option_sign(portfolio.get("option_type", "call"))
+    columns = {name: np.broadcast_to(values, (size,)).copy() for name, values in columns.items()}
+    shocks, axes = shock_grid(spot, vol, rate, days)
+    n_scenarios = len(shocks["spot"])
+
+    # Tiles sized so every worker stays within its share of the memory budget
+    tile_size = max(1, int(memory_budget / max(workers, 1) / bytes_per_contract(model, N)))
+    total = size * n_scenarios
+    pnl = np.zeros(n_scenarios)
+
+    with stage("scenarios/base"):
+        base_inputs = [columns[name] for name in ("S", "K", "T", "r", "sigma", "q", "sign")]
+        base_value = np.empty(size)
+        for start in range(0, size, tile_size):
+            chunk = slice(start, start + tile_size)
+            base_value[chunk] = _value(model, N, exercise, *(x[chunk] for x in base_inputs))
+        columns["base_value"] = base_value
+
+    with stage("scenarios/tiles"):
+        tiles = [(start, min(start + tile_size, total)) for start in range(0, total, tile_size)]
+        state = (columns, shocks, model, N, exercise)
+        if workers > 1 and len(tiles) > 1:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=state) as pool:
+                # A bounded number of tiles in flight keeps finished results from piling up
+                pending = deque()
+                for tile in tiles:
+                    pending.append(pool.submit(_evaluate_tile, *tile))
+                    while len(pending) >= 2 * workers:
+                        first, tile_pnl = pending.popleft().result()
+                        pnl[first:first + len(tile_pnl)] += tile_pnl
+                for future in pending:
+                    first, tile_pnl = future.result()
+                    pnl[first:first + len(tile_pnl)] += tile_pnl
+        else:
+            _init_worker(*state)
+            try:
+                for tile in tiles:
+                    first, tile_pnl = _evaluate_tile(*tile)
+                    pnl[first:first + len(tile_pnl)] += tile_pnl
+            finally:
+                _worker_state.clear()
+    count("scenario_evaluations", total)
+
+    return {
+        "pnl": pnl.reshape(tuple(len(values) for values in axes.values())),
+        "axes": axes,
+        "base_value": float(columns["quantity"] @ base_value),
+        "evaluations": total,
+        "tiles": len(tiles),
+        "tile_size": tile_size,
+    }
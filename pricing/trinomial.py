@@ -0,0 +1,209 @@
+"""Trinomial (Boyle) lattice pricing."""
+
+import numpy as np
+
+from ._batch import RATE_BUMP, bump_batch, check_exercise, flatten_batch, option_sign, restore_batch, sigma_bumps
+from .instrument import count, stage
+
+# Fewest steps for the Greeks: the rollback only keeps the step-1 nodes when it passes step 2
+GREEKS_MIN_STEPS = 2
+
+
+def _rollback(S, K, T, r, sigma, q, sign, N, american, return_boundary=False, keep_steps=0, smooth=False):
+    """Roll a flat batch of contracts back to the root of the tree.
+
+    With ``smooth`` the values at step N - 1 are Black-Scholes prices over the
+    last time step (Broadie-Detemple smoothing), which removes the odd/even
+    oscillation of the plain tree. Returns the root values, the early-exercise
+    boundary (NaN unless requested) and a list with copies of the value vectors
+    at steps 1..keep_steps.
+    """
+    with stage("trinomial/build"):
+        dt = T / N  # Time step
+        step = sigma * np.sqrt(2 * dt)  # log of the up factor; the middle branch leaves the price unchanged
+
+        # Boyle probabilities: two half-step binomial moves combined into one trinomial step
+        half_up = np.exp(sigma * np.sqrt(dt / 2))
+        half_growth = np.exp((r - q) * dt / 2)  # drift net of the dividend yield
+        p_u = ((half_growth - 1 / half_up) / (half_up - 1 / half_up)) ** 2
+        p_d = ((half_up - half_growth) / (half_up - 1 / half_up)) ** 2
+        p_m = 1 - p_u - p_d  # Middle probability
+        # p_m < 0 when sigma * sqrt(dt / 2) is small next to |r - q| * dt / 2: no valid tree, so NaN propagates
+        p_m = np.where(p_m >= 0, p_m, np.nan)
+        discount = np.exp(-r * dt)
+        p_u, p_m, p_d = discount * p_u, discount * p_m, discount * p_d
+
+        # Terminal stock prices S * u^(N - k) for k = 0..2N; node k at step i sits on row N - i + k
+        stock_levels = S * np.exp(np.arange(N, -N - 1, -1)[:, None] * step)
+        option_values = np.maximum(sign * (stock_levels - K), 0)
+
+        # Early-exercise boundary: the critical stock price at each step (NaN where no node is exercised)
+        boundary = np.full((N + 1, S.size), np.nan)
+        if american:
+            boundary[N] = K
+        early_values = [None] * keep_steps
+
+        last_step = N
+        if smooth:
+            from .bsm import black_scholes  # imported here so the lattices alone do not load SciPy
+
+            last_step = N - 1
+            stock_prices = stock_levels[1:2 * N]
+            option_values[:2 * N - 1] = black_scholes(stock_prices, K, dt, r, sigma, sign > 0, q)
+            if american:
+                np.maximum(option_values[:2 * N - 1], sign * (stock_prices - K), out=option_values[:2 * N - 1])
+
+    with stage("trinomial/rollback"):
+        # Roll back a single value vector: node k at step i sees nodes k, k + 1 and k + 2 at step i + 1
+        for i in range(last_step - 1, -1, -1):
+            width = 2 * i + 1
+            option_values[:width] = (
+                p_u * option_values[:width] +
+                p_m * option_values[1:width + 1] +
+                p_d * option_values[2:width + 2]
+            )
+            if american:
+                stock_prices = stock_levels[N - i:N + i + 1]
+                exercise_values = sign * (stock_prices - K)
+                if return_boundary:
+                    exercised = (exercise_values > 0) & (exercise_values >= option_values[:width])
+                    # Highest exercised price for puts, lowest for calls
+                    edge = -sign * np.max(np.where(exercised, -sign * stock_prices, -np.inf), axis=0)
+                    boundary[i] = np.where(np.isfinite(edge), edge, np.nan)
+                np.maximum(option_values[:width], exercise_values, out=option_values[:width])
+            if 1 <= i <= keep_steps:
+                early_values[i - 1] = option_values[:width].copy()
+    count("lattice_nodes", (N + 1) ** 2 * S.size)
+
+    return option_values[0], boundary, early_values
+
+
+def _ladder(S, K, T, r, sigma, q, N, american):
+    """Call and put values for every strike in ``K``, from one tree per volatility in ``sigma``.
+
+    Returns the call and put values, each shaped (len(K), len(sigma)).
+    """
+    with stage("trinomial/build"):
+        dt = T / N
+        step = sigma * np.sqrt(2 * dt)
+        half_up = np.exp(sigma * np.sqrt(dt / 2))
+        half_growth = np.exp((r - q) * dt / 2)
+        p_u = ((half_growth - 1 / half_up) / (half_up - 1 / half_up)) ** 2
+        p_d = ((half_up - half_growth) / (half_up - 1 / half_up)) ** 2
+        p_m = 1 - p_u - p_d
+        p_m = np.where(p_m >= 0, p_m, np.nan)
+        discount = np.exp(-r * dt)
+        p_u, p_m, p_d = discount * p_u, discount * p_m, discount * p_d
+        stock_levels = S * np.exp(np.arange(N, -N - 1, -1)[:, None] * step)
+
+    with stage("trinomial/rollback"):
+        if not american:
+            # Discounted probabilities of the terminal nodes, rolled forward once per tree;
+            # each European value is then one weighted sum of its payoffs
+            weights = np.zeros((2 * N + 1, sigma.size))
+            weights[0] = 1
+            for i in range(N):
+                previous = weights[:2 * i + 1].copy()
+                weights[:2 * i + 1] = p_u * previous
+                weights[1:2 * i + 2] += p_m * previous
+                weights[2:2 * i + 3] += p_d * previous
+            calls = np.einsum("jv,jvk->kv", weights, np.maximum(stock_levels[:, :, None] - K, 0))
+            # Put-call parity holds exactly on the tree
+            puts = calls - (weights * stock_levels).sum(axis=0) + K[:, None] * weights.sum(axis=0)
+            count("lattice_nodes", (N + 1) ** 2 * sigma.size)
+            return calls, puts
+
+        # American values: every strike and both option types rolled back together on the shared tree
+        sign = np.repeat([1.0, -1.0], K.size)
+        strikes = np.tile(K, 2)
+        option_values = np.maximum(sign * (stock_levels[:, :, None] - strikes), 0)
+        p_u, p_m, p_d = p_u[:, None], p_m[:, None], p_d[:, None]
+        for i in range(N - 1, -1, -1):
+            width = 2 * i + 1
+            option_values[:width] = (
+                p_u * option_values[:width] +
+                p_m * option_values[1:width + 1] +
+                p_d * option_values[2:width + 2]
+            )
+            exercise_values = sign * (stock_levels[N - i:N + i + 1, :, None] - strikes)
+            np.maximum(option_values[:width], exercise_values, out=option_values[:width])
+    count("lattice_nodes", (N + 1) ** 2 * sigma.size * sign.size)
+
+    calls, puts = option_values[0].reshape(sigma.size, 2, K.size).transpose(1, 2, 0)
+    return calls, puts
+
+
+def trinomial_model(S, K, T, r, sigma, N, option_type="call", q=0.0, exercise="european", return_boundary=False):
+    """Boyle trinomial price of European or American options.
+
+    Inputs broadcast onto a batch that is rolled back together, using O(N x batch)
+    memory. ``q`` is a continuous dividend yield. With ``return_boundary=True`` the
+    early-exercise boundary (critical stock price per step, shape (N+1,) + batch
+    shape) is returned alongside the price. Contracts whose step is too coarse
+    for valid branch probabilities (sigma too small next to r - q) are NaN.
+    """
+    # Parameters broadcast to a batch; the lattice keeps nodes on axis 0 and the batch on axis 1
+    shape, S, K, T, r, sigma, q, sign = flatten_batch(S, K, T, r, sigma, q, option_sign(option_type))
+    american = check_exercise(exercise)
+
+    price, boundary, _ = _rollback(S, K, T, r, sigma, q, sign, N, american, return_boundary)
+
+    price = restore_batch(price, shape)
+    if return_boundary:
+        return price, boundary.reshape((N + 1,) + shape)
+    return price
+
+
+def trinomial_greeks(S, K, T, r, sigma, N, option_type="call", q=0.0, exercise="european"):
+    """Price, delta, gamma, vega, theta and rho from the trinomial tree.
+
+    Delta, gamma and theta are read off the three nodes at step 1 of the
+    rollback that prices the option. Vega and rho use central bumps (a forward
+    bump for vega at very low volatility) that are stacked onto the batch axis,
+    so everything comes from one rollback. ``N`` is raised to
+    ``GREEKS_MIN_STEPS`` if smaller.
+    Returns a dict of arrays (floats for scalar inputs); theta is per year.
+    """
+    shape, S, K, T, r, sigma, q, sign = flatten_batch(S, K, T, r, sigma, q, option_sign(option_type))
+    american = check_exercise(exercise)
+    N = max(N, GREEKS_MIN_STEPS)
+
+    root, _, (step_1,) = _rollback(*bump_batch(S, K, T, r, sigma, q, sign), N, american, keep_steps=1)
+
+    size = S.size
+    price, sigma_up, sigma_down, rate_up, rate_down = root.reshape(5, size)
+    f_u, f_m, f_d = step_1[:, :size]
+
+    dt = T / N
+    h = sigma * np.sqrt(2 * dt)
+    S_u, S_d = S * np.exp(h), S * np.exp(-h)
+
+    greeks = {
+        "price": price,
+        "delta": (f_u - f_d) / (S_u - S_d),
+        "gamma": ((f_u - f_m) / (S_u - S) - (f_m - f_d) / (S - S_d)) / ((S_u - S_d) / 2),
+        "vega": (sigma_up - sigma_down) / np.subtract(*sigma_bumps(sigma)),
+        "theta": (f_m - price) / dt,
+        "rho": (rate_up - rate_down) / (2 * RATE_BUMP),
+    }
+    return {name: restore_batch(values, shape) for name, values in greeks.items()}
+
+
+def trinomial_ladder(S, K, T, r, sigma, N, q=0.0, exercise="european"):
+    """Call and put prices for a ladder of strikes from a single trinomial tree.
+
+    The tree depends on S, T, r, sigma and q but not on the strike or payoff,
+    so every strike in ``K`` and both option types share one build: European
+    prices weight the terminal payoffs by node probabilities rolled forward
+    once, American ones roll all payoffs back together. ``sigma`` may also be
+    1-D (one tree per volatility). Returns a dict with ``call`` and ``put``
+    shaped (len(K),), (len(K), len(sigma)) or scalar.
+    """
+    american = check_exercise(exercise)
+    strikes = np.atleast_1d(np.asarray(K, dtype=float))
+    sigmas = np.atleast_1d(np.asarray(sigma, dtype=float))
+
+    calls, puts = _ladder(float(S), strikes, float(T), float(r), sigmas, float(q), N, american)
+
+    shape = np.shape(K) + np.shape(sigma)
+    return {"call": restore_batch(calls, shape), "put": restore_batch(puts, shape)}
@@ -0,0 +1,355 @@
+"""Local HTTP/JSON pricing service with request coalescing and micro-batching.
+
+Concurrent single-contract requests for the same engine settings are queued
+and priced together in one vectorized call, once ``--max-batch`` contracts are
+waiting or the oldest has waited ``--max-wait-ms``. Results are kept in a
+bounded cache, requests beyond ``--max-pending`` outstanding contracts are
+rejected with 503, and latency/throughput counters are served at /metrics.
+
+    python pricing_service.py --port 8765
+
+    POST /price   {"model": "binomial", "S": 100, "K": 100, "T": 1, "r": 0.05, "sigma": 0.2,
+                   "option_type": "put", "q": 0, "N": 200, "exercise": "american"}
+    POST /greeks  same fields; returns price, delta, gamma, vega, theta and rho
+    POST /iv      {"price": 10.45, "S": 100, "K": 100, "T": 1, "r": 0.05, "option_type": "call", "q": 0}
+    GET  /metrics request, cache, batch and latency counters
+    GET  /health
+
+``model`` is "black-scholes" (default), "binomial" or "trinomial"; ``N`` and
+``exercise`` only apply to the lattices. Implied volatility is Black-Scholes only.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from pricing import (
+    PriceCache,
+    binomial,
+    binomial_greeks,
+    binomial_model,
+    black_scholes,
+    black_scholes_greeks,
+    implied_volatility,
+    trinomial,
+    trinomial_greeks,
+    trinomial_model,
+)
+from pricing.cache import make_key
+
+# model -> (price engine, Greeks engine)
+ENGINES = {
+    "black-scholes": (black_scholes, black_scholes_greeks),
+    "binomial": (binomial_model, binomial_greeks),
+    "trinomial": (trinomial_model, trinomial_greeks),
+}
+# Fewest lattice steps the Greeks engines can read delta, gamma and theta from
+GREEKS_MIN_STEPS = {"binomial": binomial.GREEKS_MIN_STEPS, "trinomial": trinomial.GREEKS_MIN_STEPS}
+CONTRACT_FIELDS = ("S", "K", "T", "r", "sigma", "q")
+MAX_STEPS = 5000
+# Inputs that must be strictly positive for the price and Greeks endpoints
+POSITIVE_FIELDS = ("S", "K", "T", "sigma")
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class RequestError(ValueError):
+    """Invalid request, reported to the client as 400."""
+
+
+def parse_contract(endpoint, body):
+    """Validate a request body, returning (batch key, per-contract inputs).
+
+    Contracts that share a batch key can be priced in one engine call; the
+    inputs are the values that vary within a batch. Every contract is checked
+    here, before it joins a batch, so one bad contract cannot fail the others.
+    """
+    if not isinstance(body, dict):
+        raise RequestError("request body must be a JSON object")
+    fields = ("price", "S", "K", "T", "r", "q") if endpoint == "iv" else CONTRACT_FIELDS
+    inputs = {}
+    for name in fields:
+        if name not in body and name != "q":
+            raise RequestError(f"missing field {name!r}")
+        try:
+            inputs[name] = float(body.get(name, 0.0))
+        except (TypeError, ValueError):
+            raise RequestError(f"field {name!r} must be a number") from None
+        if not math.isfinite(inputs[name]):
+            raise RequestError(f"field {name!r} must be finite")
+        if endpoint != "iv" and name in POSITIVE_FIELDS and inputs[name] <= 0:
+            raise RequestError(f"field {name!r} must be positive")
+    inputs["option_type"] = body.get("option_type", "call")
+    if inputs["option_type"] not in ("call", "put"):
+        raise RequestError("option_type must be 'call' or 'put'")
+
+    model = body.get("model", "black-scholes")
+    if model not in ENGINES:
+        raise RequestError(f"model must be one of {tuple(ENGINES)}")
+    if endpoint == "iv":
+        if model != "black-scholes":
+            raise RequestError("implied volatility is only available for the Black-Scholes model")
+        return ("iv",), inputs
+    if model == "black-scholes":
+        if body.get("exercise", "european") != "european":
+            raise RequestError("Black-Scholes only prices European options")
+        return (endpoint, model), inputs
+
+    N = body.get("N", 100)
+    min_steps = GREEKS_MIN_STEPS[model] if endpoint == "greeks" else 1
+    if not isinstance(N, int) or not min_steps <= N <= MAX_STEPS:
+        raise RequestError(f"N must be an integer between {min_steps} and {MAX_STEPS}")
+    exercise = body.get("exercise", "european")
+    if exercise not in ("european", "american"):
+        raise RequestError("exercise must be 'european' or 'american'")
+    return (endpoint, model, N, exercise), inputs
+
+
+def price_batch(key, batch):
+    """Price a list of contract inputs sharing ``key`` in one vectorized call; returns one dict per contract."""
+    columns = {name: np.array([inputs[name] for inputs in batch]) for name in batch[0]}
+    if key[0] == "iv":
+        vols, status = implied_volatility(columns["price"], columns["S"], columns["K"], columns["T"], columns["r"],
+                                          columns["option_type"], columns["q"], return_status=True)
+        results = {"implied_volatility": np.atleast_1d(vols), "status": np.atleast_1d(status)}
+    else:
+        endpoint, model, *lattice = key
+        engine = ENGINES[model][1 if endpoint == "greeks" else 0]
+        args = [columns[name] for name in ("S", "K", "T", "r", "sigma")]
+        if lattice:
+            N, exercise = lattice
+            result = engine(*args, N, columns["option_type"], columns["q"], exercise)
+        else:
+            result = engine(*args, columns["option_type"], columns["q"])
+        results = result if endpoint == "greeks" else {"price": result}
+        results = {name: np.atleast_1d(values) for name, values in results.items()}
+    # JSON has no NaN or infinity: unpriceable contracts come back as null
+    return [
+        {name: values[i].item() if math.isfinite(values[i]) else None for name, values in results.items()}
+        for i in range(len(batch))
+    ]
+
+
+class Metrics:
+    """Request counters and a rolling window of latencies."""
+
+    def __init__(self, window=10_000, rate_window=10):
+        self.started = time.monotonic()
+        self.latencies = deque(maxlen=window)  # seconds
+        self.rate_window = rate_window
+        self.per_second = deque(maxlen=rate_window + 1)  # [whole second, completions in it]
+        self.completed = 0
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_contracts = 0
+
+    def record(self, latency):
+        self.latencies.append(latency)
+        self.completed += 1
+        second = int(time.monotonic())
+        if self.per_second and self.per_second[-1][0] == second:
+            self.per_second[-1][1] += 1
+        else:
+            self.per_second.append([second, 1])
+
+    def snapshot(self, cache, pending):
+        now = time.monotonic()
+        latencies = np.array(self.latencies) * 1e3
+        # Completions over the last rate_window whole seconds (the current one is still filling)
+        current = int(now)
+        recent = sum(count for second, count in self.per_second if current - self.rate_window <= second < current)
+        window = min(self.rate_window, max(current - int(self.started), 1))
+        cache_stats = cache.stats()
+        return {
+            "uptime_s": now - self.started,
+            "requests": self.requests,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "pending": pending,
+            "completed": self.completed,
+            "throughput_rps": recent / window,
+            "latency_ms": {
+                "p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+                "p99": float(np.percentile(latencies, 99)) if len(latencies) else None,
+                "samples": len(latencies),
+            },
+            "batches": self.batches,
+            "mean_batch_size": self.batched_contracts / self.batches if self.batches else 0.0,
+            "cache": cache_stats,
+        }
+
+
+class MicroBatcher:
+    """Coalesces concurrent contracts per batch key into vectorized engine calls."""
+
+    def __init__(self, max_batch, max_wait, metrics):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.metrics = metrics
+        self.pending = 0
+        self._open = {}  # batch key -> (list of (inputs, future), event set once the batch is full)
+        self._flushes = set()  # strong references to the running flush tasks
+
+    def submit(self, key, inputs):
+        future = asyncio.get_running_loop().create_future()
+        self.pending += 1
+        if key not in self._open:
+            self._open[key] = ([], asyncio.Event())
+            task = asyncio.create_task(self._flush(key, *self._open[key]))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        queue, full = self._open[key]
+        queue.append((inputs, future))
+        if len(queue) >= self.max_batch:
+            # Close the batch so later requests start a new one
+            del self._open[key]
+            full.set()
+        return future
+
+    async def _flush(self, key, queue, full):
+        try:
+            await asyncio.wait_for(full.wait(), self.max_wait)
+        except asyncio.TimeoutError:
+            if self._open.get(key, (None,))[0] is queue:
+                del self._open[key]
+
+        self.metrics.batches += 1
+        self.metrics.batched_contracts += len(queue)
+        try:
+            # Run the engine off the event loop so it keeps accepting (and batching) requests
+            results = await asyncio.get_running_loop().run_in_executor(
+                None, price_batch, key, [inputs for inputs, _ in queue]
+            )
+        except Exception as error:
+            for _, future in queue:
+                if not future.done():  # done if the client went away
+                    future.set_exception(error)
+        else:
+            for (_, future), result in zip(queue, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self.pending -= len(queue)
+
+
+class PricingService:
+    def __init__(self, max_batch=256, max_wait=0.002, max_pending=10_000, cache_size=100_000, cache_ttl=3600.0):
+        self.metrics = Metrics()
+        self.cache = PriceCache(maxsize=cache_size, ttl=cache_ttl)
+        self.batcher = MicroBatcher(max_batch, max_wait, self.metrics)
+        self.max_pending = max_pending
+
+    async def handle(self, method, path, body):
+        """Route one request; returns (status, JSON-serializable payload, extra headers)."""
+        if path == "/health":
+            return 200, {"status": "ok"}, {}
+        if path == "/metrics":
+            return 200, self.metrics.snapshot(self.cache, self.batcher.pending), {}
+        endpoint = {"/price": "price", "/greeks": "greeks", "/iv": "iv"}.get(path)
+        if endpoint is None:
+            return 404, {"error": f"unknown path {path}"}, {}
+        if method != "POST":
+            return 405, {"error": "use POST"}, {"Allow": "POST"}
+
+        start = time.perf_counter()
+        self.metrics.requests += 1
+        try:
+            key, inputs = parse_contract(endpoint, json.loads(body or b"null"))
+        except (RequestError, json.JSONDecodeError) as error:
+            self.metrics.errors += 1
+            return 400, {"error": str(error)}, {}
+
+        cache_key = make_key(price_batch, batch_key=key, **inputs)
+        result = self.cache.get(cache_key)
+        if result is None:
+            # Backpressure: shed load instead of letting the queue (and latency) grow without bound
+            if self.batcher.pending >= self.max_pending:
+                self.metrics.rejected += 1
+                return 503, {"error": "overloaded, retry later"}, {"Retry-After": "1"}
+            try:
+                result = await self.batcher.submit(key, inputs)
+            except Exception as error:
+                # Inputs were validated by parse_contract, so an engine failure is ours, not the client's
+                self.metrics.errors += 1
+                return 500, {"error": f"pricing failed: {error}"}, {}
+            self.cache.set(cache_key, result)
+        self.metrics.record(time.perf_counter() - start)
+        return 200, result, {}
+
+    async def serve_connection(self, reader, writer):
+        """HTTP/1.1 with keep-alive; one request at a time per connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload, extra_headers = await self.handle(method, path.split("?")[0], body)
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                head = [
+                    f"HTTP/1.1 {status} {REASONS[status]}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(data)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                ] + [f"{name}: {value}" for name, value in extra_headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(args):
+    service = PricingService(args.max_batch, args.max_wait_ms / 1e3, args.max_pending, args.cache_size)
+    server = await asyncio.start_server(service.serve_connection, args.host, args.port, backlog=1024)
+    print(f"Pricing service listening on http://{args.host}:{args.port}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (localhost only by default)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=256, help="largest micro-batch per engine call")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="longest a request waits for its batch to fill")
+    parser.add_argument("--max-pending", type=int, default=10_000, help="outstanding contracts before returning 503")
+    parser.add_argument("--cache-size", type=int, default=100_000, help="cached results")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass